@@ -0,0 +1,8 @@
+"""
+Script file: __init__.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Benchmarks of the n3rgy data API client
+"""
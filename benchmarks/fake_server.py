@@ -0,0 +1,335 @@
+"""
+Script file: fake_server.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Local stand-in for the n3rgy data and consent APIs, used by the benchmarks
+    Run standalone with: python -m benchmarks.fake_server --port 8080
+"""
+
+import json
+import random
+import asyncio
+import argparse
+
+from datetime import datetime, timedelta
+from aiohttp import web
+
+INPUT_DATETIME_FORMAT = '%Y%m%d%H%M'
+READING_DATETIME_FORMAT = '%Y-%m-%d %H:%M'
+TARIFF_DATE_FORMAT = '%Y-%m-%d'
+SLOT = timedelta(minutes=30)
+
+UTILITIES = {
+    'electricity': ['consumption', 'production', 'tariff'],
+    'gas': ['consumption', 'tariff']
+}
+
+
+def slot_value(dt):
+    """
+    Deterministic half-hour reading for a slot
+    :param dt: slot date/time
+    :return: reading value
+    """
+    return round(0.05 + (dt.hour * 2 + dt.minute // 30) / 100, 3)
+
+
+def slot_price(dt):
+    """
+    Deterministic two-rate price for a slot, in pence
+    :param dt: slot date/time
+    :return: price
+    """
+    return 9.5 if dt.hour < 7 else 21.3
+
+
+class FakeN3rgyServer:
+    """
+    aiohttp stand-in for the n3rgy APIs.
+    Covers find-mpxn, discovery, consumption/production series, tariff and the consent endpoints.
+    Latency, payload size and error rate are configurable, and long series can be split into
+    partial (206) responses the way the live API does.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, error_rate=0.0, max_slots=None,
+                 padding=0, seed=0, history_start=None):
+        """
+        Initialize the fake server
+        :param host: listen address
+        :param port: listen port, 0 picks a free one
+        :param latency: seconds added to every response
+        :param error_rate: share of requests answered with 503
+        :param max_slots: half-hours per response before answering 206, None for no limit
+        :param padding: extra bytes added to every reading to grow the payload
+        :param seed: random seed for the injected errors
+        :param history_start: date/time of the oldest reading the meter holds, None for no limit
+        :return: none
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_slots = max_slots
+        self.padding = 'x' * padding
+        self.random = random.Random(seed)
+        self.history_start = history_start
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self._runner = None
+
+    @property
+    def url(self):
+        """
+        Return the base URL of the server
+        :param: none
+        :return: base URL
+        """
+        return f'http://{self.host}:{self.port}'
+
+    def build_app(self):
+        """
+        Build the aiohttp application
+        :param: none
+        :return: web application
+        """
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_post('/consents/sessions', self.consent_session)
+        app.router.add_get('/consent/{query}', self.consent_handover)
+        app.router.add_get('/find-mpxn/{mpxn}', self.find_mpxn)
+        app.router.add_get('/{mpxn}', self.utilities)
+        app.router.add_get('/{mpxn}/{utility}', self.reading_types)
+        app.router.add_get('/{mpxn}/{utility}/{reading_type}', self.elements)
+        app.router.add_get('/{mpxn}/{utility}/{reading_type}/{element}', self.readings)
+        return app
+
+    async def start(self):
+        """
+        Start listening on the current event loop
+        :param: none
+        :return: base URL
+        """
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def stop(self):
+        """
+        Stop the server
+        :param: none
+        :return: none
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        """
+        Apply latency and injected errors, and count traffic
+        :param request: web request
+        :param handler: route handler
+        :return: web response
+        """
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, headers={'Retry-After': '0'})
+
+        response = await handler(request)
+        self.bytes_sent += len(response.body or b'')
+        return response
+
+    @staticmethod
+    def respond(data, status=200):
+        """
+        Serialize a JSON response
+        :param data: response data
+        :param status: status code
+        :return: web response
+        """
+        return web.Response(status=status, body=json.dumps(data).encode(), content_type='application/json')
+
+    async def consent_session(self, request):
+        """
+        POST /consents/sessions
+        :param request: web request
+        :return: session id
+        """
+        body = await request.json()
+        return self.respond({'sessionId': f"session-{body.get('mpxn')}"}, status=201)
+
+    async def consent_handover(self, request):
+        """
+        GET /consent/{query}
+        :param request: web request
+        :return: empty response
+        """
+        return web.Response(status=200)
+
+    async def find_mpxn(self, request):
+        """
+        GET /find-mpxn/{mpxn}
+        :param request: web request
+        :return: device type
+        """
+        return self.respond({'mpxn': request.match_info['mpxn'], 'deviceType': 'ESME'})
+
+    async def utilities(self, request):
+        """
+        GET /{mpxn}
+        :param request: web request
+        :return: utilities
+        """
+        return self.respond({'entries': list(UTILITIES)})
+
+    async def reading_types(self, request):
+        """
+        GET /{mpxn}/{utility}
+        :param request: web request
+        :return: reading types
+        """
+        types = UTILITIES.get(request.match_info['utility'])
+        if types is None:
+            return web.Response(status=404)
+        return self.respond({'entries': types})
+
+    async def elements(self, request):
+        """
+        GET /{mpxn}/{utility}/{reading_type}
+        :param request: web request
+        :return: meter elements
+        """
+        return self.respond({'entries': [1]})
+
+    async def readings(self, request):
+        """
+        GET /{mpxn}/{utility}/{reading_type}/{element}
+        :param request: web request
+        :return: series or tariff
+        """
+        utility = request.match_info['utility']
+        reading_type = request.match_info['reading_type']
+        if reading_type not in UTILITIES.get(utility, []):
+            return web.Response(status=404)
+
+        # previous day by default
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        try:
+            start = datetime.strptime(request.query['start'], INPUT_DATETIME_FORMAT)
+            end = datetime.strptime(request.query['end'], INPUT_DATETIME_FORMAT)
+        except KeyError:
+            start, end = today - timedelta(days=1), today - timedelta(minutes=1)
+        except ValueError:
+            return web.Response(status=400)
+
+        if reading_type == 'tariff':
+            return self.respond(self.tariff(start, end))
+        return self.series(request.path, start, end)
+
+    def series(self, resource, start, end):
+        """
+        Build a consumption or production response, partial when longer than max_slots
+        :param resource: request path
+        :param start: start date/time
+        :param end: end date/time
+        :return: web response
+        """
+        values = []
+        dt = start if self.history_start is None else max(start, self.history_start)
+        status = 200
+        while dt <= end:
+            if self.max_slots is not None and len(values) >= self.max_slots:
+                status = 206
+                break
+            value = {'timestamp': dt.strftime(READING_DATETIME_FORMAT), 'value': slot_value(dt)}
+            if self.padding:
+                value['note'] = self.padding
+            values.append(value)
+            dt += SLOT
+
+        data = {
+            'resource': resource,
+            'responseTimestamp': datetime.utcnow().isoformat(),
+            'start': start.strftime(INPUT_DATETIME_FORMAT),
+            'end': end.strftime(INPUT_DATETIME_FORMAT),
+            'granularity': 'halfhour',
+            'values': values,
+            'unit': 'kWh'
+        }
+        if self.history_start is not None:
+            data['availableCacheRange'] = {
+                'start': self.history_start.strftime(INPUT_DATETIME_FORMAT),
+                'end': datetime.now().strftime(INPUT_DATETIME_FORMAT)
+            }
+        return self.respond(data, status=status)
+
+    def tariff(self, start, end):
+        """
+        Build a tariff response covering whole days
+        :param start: start date/time
+        :param end: end date/time
+        :return: response data
+        """
+        day = start.replace(hour=0, minute=0)
+        prices = []
+        charges = []
+        while day <= end:
+            charges.append({'startDate': day.strftime(TARIFF_DATE_FORMAT), 'value': 24.1})
+            for i in range(48):
+                dt = day + i * SLOT
+                prices.append({'timestamp': dt.strftime(READING_DATETIME_FORMAT), 'value': slot_price(dt)})
+            day += timedelta(days=1)
+        return {'values': [{'standingCharges': charges, 'prices': prices}]}
+
+
+def serve(ready=None, **kwargs):
+    """
+    Run the fake server until interrupted
+    :param ready: multiprocessing queue receiving the base URL once listening
+    :param kwargs: FakeN3rgyServer parameters
+    :return: none
+    """
+    server = FakeN3rgyServer(**kwargs)
+    loop = asyncio.new_event_loop()
+    url = loop.run_until_complete(server.start())
+    if ready is not None:
+        ready.put(url)
+    else:
+        print(f"n3rgy stand-in listening on {url}")
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.stop())
+
+
+def main():
+    """
+    Command line entry point
+    :param: none
+    :return: none
+    """
+    parser = argparse.ArgumentParser(description="Local n3rgy API stand-in")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument('--max-slots', type=int, default=None, help="half-hours per response before a 206")
+    parser.add_argument('--padding', type=int, default=0, help="extra bytes per reading")
+    args = parser.parse_args()
+
+    serve(host=args.host, port=args.port, latency=args.latency, error_rate=args.error_rate,
+          max_slots=args.max_slots, padding=args.padding)
+
+
+if __name__ == '__main__':
+    main()
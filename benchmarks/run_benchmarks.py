@@ -0,0 +1,371 @@
+"""
+Script file: run_benchmarks.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    End-to-end benchmarks of the n3rgy client against the local stand-in server
+    Run from the repository root with: python -m benchmarks.run_benchmarks
+    Requires homeassistant and aiohttp to be installed
+"""
+
+import gc
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import statistics
+import tracemalloc
+import multiprocessing
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.n3rgy.const import INPUT_DATETIME_FORMAT, READING_TYPE_CONSUMPTION, DEFAULT_RATE_LIMIT
+from custom_components.n3rgy.n3rgy_api import N3rgyDataApi, N3rgyAsyncDataApi, create_async_session
+from custom_components.n3rgy.throttle import RequestScheduler
+from custom_components.n3rgy.coordinator import N3rgyDataCoordinator
+from custom_components.n3rgy.metadata import N3rgyMetadataCache
+from custom_components.n3rgy.sensor import N3rgySensor, N3rgyCostSensor
+
+from .fake_server import serve
+
+MPXN = '1234567891234'
+WINDOW_END = datetime(2026, 1, 31, 23, 59)
+DEFAULT_WINDOWS = (1, 7, 30, 90)
+FLEET_POOL_SIZE = 20
+
+
+def get_range(days):
+    """
+    Window of whole days ending at WINDOW_END
+    :param days: window length in days
+    :return: (start, end) in the format YYYYMMDDHHmm
+    """
+    start = WINDOW_END - timedelta(days=days) + timedelta(minutes=1)
+    return (start.strftime(INPUT_DATETIME_FORMAT), WINDOW_END.strftime(INPUT_DATETIME_FORMAT))
+
+
+def unthrottled():
+    """
+    Request scheduler that does not limit the benchmark request rate
+    :param: none
+    :return: request scheduler
+    """
+    return RequestScheduler(rate=1e6, burst=1e6, backoff_base=0.01, backoff_max=0.1)
+
+
+def summarize(name, days, latencies, cpu, peak):
+    """
+    Summarize the samples of a scenario
+    :param name: scenario name
+    :param days: window length in days
+    :param latencies: wall time of every iteration in seconds
+    :param cpu: process CPU time of all iterations in seconds
+    :param peak: peak traced memory of one iteration in bytes
+    :return: result dict
+    """
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        'scenario': name,
+        'days': days,
+        'iterations': len(latencies),
+        'mean_ms': 1000 * total / len(latencies),
+        'p50_ms': 1000 * statistics.median(latencies),
+        'p95_ms': 1000 * latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        'per_second': len(latencies) / total if total else 0.0,
+        'cpu_ms': 1000 * cpu / len(latencies),
+        'peak_kib': peak / 1024
+    }
+
+
+def bench_sync(name, days, iterations, call):
+    """
+    Benchmark a blocking call
+    :param name: scenario name
+    :param days: window length in days
+    :param iterations: number of timed iterations
+    :param call: function to benchmark
+    :return: result dict
+    """
+    call()
+    gc.collect()
+
+    latencies = []
+    cpu = time.process_time()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+    cpu = time.process_time() - cpu
+
+    # allocations are traced on a separate run so the tracing overhead stays out of the timings
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return summarize(name, days, latencies, cpu, peak)
+
+
+async def async_bench(name, days, iterations, call):
+    """
+    Benchmark a coroutine function
+    :param name: scenario name
+    :param days: window length in days
+    :param iterations: number of timed iterations
+    :param call: coroutine function to benchmark
+    :return: result dict
+    """
+    await call()
+    gc.collect()
+
+    latencies = []
+    cpu = time.process_time()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    cpu = time.process_time() - cpu
+
+    tracemalloc.start()
+    await call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return summarize(name, days, latencies, cpu, peak)
+
+
+def build_entry(url, start, end):
+    """
+    Minimal config entry for the coordinator and sensors
+    :param url: fake server URL
+    :param start: window start
+    :param end: window end
+    :return: config entry stand-in
+    """
+    return SimpleNamespace(
+        entry_id='benchmark',
+        data={'host': url, 'api_key': 'benchmark', 'property_id': MPXN, 'name': 'n3rgy'},
+        options={'daily_update': False, 'start': start, 'end': end, 'utility': 'electricity'}
+    )
+
+
+def read_state(entity):
+    """
+    Read what home assistant reads when it writes the state of an entity
+    :param entity: sensor entity
+    :return: (state, unit, attributes)
+    """
+    return (entity.state, entity.unit_of_measurement, entity.extra_state_attributes)
+
+
+async def async_update_path(hass, api, metadata, entry, coordinator=None):
+    """
+    One poll cycle: coordinator fetch followed by the state read of every sensor
+    :param hass: hass object
+    :param api: n3rgy async api client
+    :param metadata: shared metadata cache
+    :param entry: config entry
+    :param coordinator: coordinator to poll again, a fresh one when omitted
+    :return: coordinator
+    """
+    if coordinator is None:
+        coordinator = N3rgyDataCoordinator(hass, api, entry, metadata=metadata)
+    coordinator.scheduler.next_poll = None
+    coordinator.data = await coordinator._async_update_data()
+
+    for key in coordinator.data:
+        read_state(N3rgySensor(coordinator, key, 'n3rgy', 'ESME'))
+        if key[1] == READING_TYPE_CONSUMPTION:
+            read_state(N3rgyCostSensor(coordinator, key, 'n3rgy', 'ESME'))
+    return coordinator
+
+
+async def async_run(url, windows, iterations):
+    """
+    Run every scenario over every window length
+    :param url: fake server URL
+    :param windows: window lengths in days
+    :param iterations: timed iterations per scenario
+    :return: list of result dicts
+    """
+    results = []
+    loop = asyncio.get_running_loop()
+
+    sync_api = N3rgyDataApi(url, 'benchmark', MPXN, scheduler=unthrottled())
+    async_api = N3rgyAsyncDataApi(url, 'benchmark', MPXN, scheduler=unthrottled())
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        metadata = N3rgyMetadataCache(hass, async_api)
+
+        try:
+            for days in windows:
+                start, end = get_range(days)
+                entry = build_entry(url, start, end)
+
+                # the blocking client runs in a worker thread, as it does in home assistant
+                results.append(await loop.run_in_executor(None, bench_sync, 'sync read_consumption', days,
+                                                          iterations, lambda: sync_api.read_consumption('electricity', start, end)))
+                results.append(await async_bench('async read_consumption', days, iterations,
+                                                 lambda: async_api.read_consumption('electricity', start, end)))
+
+                # cold poll: empty coordinator, every series and tariff fetched in full
+                results.append(await async_bench('update path (cold)', days, iterations,
+                                                 lambda: async_update_path(hass, async_api, metadata, entry)))
+
+                # warm poll: nothing newer than the high-water marks
+                coordinator = await async_update_path(hass, async_api, metadata, entry)
+                results.append(await async_bench('update path (warm)', days, iterations,
+                                                 lambda: async_update_path(hass, async_api, metadata, entry, coordinator)))
+        finally:
+            sync_api.close()
+            await async_api.close()
+            await hass.async_stop(force=True)
+
+    return results
+
+
+async def async_fleet_poll(coordinators):
+    """
+    One poll cycle of every meter of a fleet, all due at once
+    :param coordinators: list of coordinators
+    :return: seconds taken
+    """
+    for coordinator in coordinators:
+        coordinator.scheduler.next_poll = None
+
+    async def async_poll(coordinator):
+        """
+        Poll one meter
+        :param coordinator: coordinator
+        :return: none
+        """
+        coordinator.data = await coordinator._async_update_data()
+
+    started = time.perf_counter()
+    await asyncio.gather(*[async_poll(c) for c in coordinators])
+    return time.perf_counter() - started
+
+
+async def async_fleet(url, meters):
+    """
+    Poll a fleet of meters sharing one connection pool and one request scheduler
+    :param url: fake server URL
+    :param meters: number of meters
+    :return: result dict
+    """
+    start, end = get_range(1)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        session = create_async_session(FLEET_POOL_SIZE)
+        scheduler = unthrottled()
+        coordinators = []
+        for i in range(meters):
+            mpxn = f'{int(MPXN) + i}'
+            api = N3rgyAsyncDataApi(url, 'benchmark', mpxn, session=session, scheduler=scheduler)
+            entry = build_entry(url, start, end)
+            entry.entry_id = mpxn
+            coordinators.append(N3rgyDataCoordinator(hass, api, entry))
+
+        try:
+            cold = await async_fleet_poll(coordinators)
+            requests = sum(c.api.metrics.summary()['requests'] for c in coordinators)
+            retained = tracemalloc.get_traced_memory()[0] - baseline
+            warm = await async_fleet_poll(coordinators)
+            warm_requests = sum(c.api.metrics.summary()['requests'] for c in coordinators) - requests
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            threads = threading.active_count()
+        finally:
+            await session.close()
+            await hass.async_stop(force=True)
+            tracemalloc.stop()
+
+    return {
+        'meters': meters,
+        'cold_s': cold,
+        'warm_s': warm,
+        'requests': requests,
+        'warm_requests': warm_requests,
+        'limited_s': requests / DEFAULT_RATE_LIMIT,
+        'kib_per_meter': retained / 1024 / meters,
+        'peak_mib': peak / 1024 / 1024,
+        'threads': threads
+    }
+
+
+def print_results(results):
+    """
+    Print the results as a table
+    :param results: list of result dicts
+    :return: none
+    """
+    print(f"{'scenario':<24}{'days':>5}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'per s':>9}{'cpu ms':>10}{'peak KiB':>10}")
+    for r in results:
+        print(f"{r['scenario']:<24}{r['days']:>5}{r['mean_ms']:>10.2f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['per_second']:>9.1f}{r['cpu_ms']:>10.2f}{r['peak_kib']:>10.1f}")
+
+
+def print_fleet(results):
+    """
+    Print the fleet results as a table
+    :param results: list of fleet result dicts
+    :return: none
+    """
+    print(f"{'meters':>8}{'cold s':>9}{'warm s':>9}{'requests':>10}{'warm req':>10}{'limited s':>11}{'KiB/meter':>11}{'peak MiB':>10}{'threads':>9}")
+    for r in results:
+        print(f"{r['meters']:>8}{r['cold_s']:>9.2f}{r['warm_s']:>9.2f}{r['requests']:>10}{r['warm_requests']:>10}{r['limited_s']:>11.0f}"
+              f"{r['kib_per_meter']:>11.1f}{r['peak_mib']:>10.1f}{r['threads']:>9}")
+
+
+def main():
+    """
+    Command line entry point
+    :param: none
+    :return: none
+    """
+    parser = argparse.ArgumentParser(description="n3rgy client benchmarks")
+    parser.add_argument('--windows', type=int, nargs='+', default=list(DEFAULT_WINDOWS), help="window lengths in days")
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0, help="server latency per response in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument('--max-slots', type=int, default=None, help="half-hours per response before a 206")
+    parser.add_argument('--padding', type=int, default=0, help="extra bytes per reading")
+    parser.add_argument('--fleet', type=int, nargs='*', default=[], help="fleet sizes to poll instead of the window scenarios")
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args()
+
+    # the server runs in its own process so its CPU time and allocations stay out of the measurements
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, kwargs={
+        'ready': ready, 'latency': args.latency, 'error_rate': args.error_rate,
+        'max_slots': args.max_slots, 'padding': args.padding
+    }, daemon=True)
+    server.start()
+    try:
+        url = ready.get(timeout=30)
+        if args.fleet:
+            results = [asyncio.run(async_fleet(url, meters)) for meters in args.fleet]
+        else:
+            results = asyncio.run(async_run(url, args.windows, args.iterations))
+    finally:
+        server.terminate()
+
+    if args.fleet:
+        print_fleet(results)
+    else:
+        print_results(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
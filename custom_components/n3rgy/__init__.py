@@ -1,23 +1,88 @@
 """
 Script file: __init__.py
 Created on: Jan 29, 2021
-Last modified on: Feb 9, 2021
+Last modified on: Oct 17, 2026
 
 Comments:
     n3rgy data API integration
 """
 
 import logging
+import voluptuous as vol
 
+from datetime import datetime
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_API_KEY,
+    EVENT_HOMEASSISTANT_STOP
+)
 from .const import (
     DOMAIN,
     PLATFORM,
-    DATA_LISTENER
+    DATA_LISTENER,
+    DATA_CLIENT,
+    DATA_ARCHIVE,
+    DATA_SCHEDULER,
+    DATA_SESSION,
+    DATA_COORDINATOR,
+    DATA_SEGMENTS,
+    ARCHIVE_FILE,
+    CONF_PROPERTY_ID,
+    CONF_UTILITY,
+    CONF_START,
+    CONF_END,
+    CONF_POOL_SIZE,
+    CONF_TIMEOUT,
+    CONF_CONCURRENCY,
+    CONF_READING_TYPE,
+    CONF_GRANULARITY,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_CONCURRENCY,
+    UTILITY_ELECTRICITY,
+    UTILITY_GAS,
+    READING_TYPE_CONSUMPTION,
+    READING_TYPE_PRODUCTION,
+    SERVICE_QUERY,
+    GRANULARITY_HALFHOUR,
+    GRANULARITY_DAY,
+    GRANULARITY_WEEK,
+    GRANULARITY_MONTH,
+    INPUT_DATETIME_FORMAT
 )
+from .n3rgy_api import N3rgyAsyncDataApi, create_async_session
+from .archive import N3rgyArchive
+from .store import SegmentCache
+from .throttle import RequestScheduler
+from .query import async_query
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def valid_datetime(value):
+    """
+    Validate a service date/time in the format YYYYMMDDHHmm
+    :param value: date/time string
+    :return: date/time object
+    """
+    try:
+        return datetime.strptime(str(value), INPUT_DATETIME_FORMAT)
+    except ValueError:
+        raise vol.Invalid(f"Invalid date/time {value}, expected YYYYMMDDHHmm")
+
+
+SERVICE_QUERY_SCHEMA = vol.Schema({
+    vol.Optional(CONF_PROPERTY_ID): str,
+    vol.Optional(CONF_UTILITY, default=UTILITY_ELECTRICITY): vol.In([UTILITY_ELECTRICITY, UTILITY_GAS]),
+    vol.Optional(CONF_READING_TYPE, default=READING_TYPE_CONSUMPTION): vol.In([READING_TYPE_CONSUMPTION, READING_TYPE_PRODUCTION]),
+    vol.Required(CONF_START): valid_datetime,
+    vol.Required(CONF_END): valid_datetime,
+    vol.Optional(CONF_GRANULARITY, default=GRANULARITY_HALFHOUR): vol.In([GRANULARITY_HALFHOUR, GRANULARITY_DAY, GRANULARITY_WEEK, GRANULARITY_MONTH])
+})
+
+
 async def async_setup(hass, config) -> bool:
     """
     Old way of setting up n3rgy component using YAML
@@ -25,10 +90,54 @@ async def async_setup(hass, config) -> bool:
     :param config: config file
     :return: true (expired)
     """
-    hass.data[DOMAIN] = {DATA_LISTENER: {}}
+    # request scheduler is shared by every n3rgy client so they draw from one rate limit
+    hass.data[DOMAIN] = {DATA_LISTENER: {}, DATA_CLIENT: {}, DATA_COORDINATOR: {}, DATA_SCHEDULER: RequestScheduler()}
+
+    async def async_handle_query(call):
+        """
+        Answer a range query from the local data, fetching only the missing sub-ranges
+        :param call: service call
+        :return: query result
+        """
+        if call.data[CONF_START] > call.data[CONF_END]:
+            raise HomeAssistantError("The query start must not be after its end")
+
+        coordinator = find_coordinator(hass, call.data.get(CONF_PROPERTY_ID))
+        try:
+            return await async_query(
+                coordinator, call.data[CONF_UTILITY], call.data[CONF_READING_TYPE],
+                call.data[CONF_START], call.data[CONF_END], call.data[CONF_GRANULARITY]
+            )
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_QUERY, async_handle_query, schema=SERVICE_QUERY_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
     return True
 
 
+def find_coordinator(hass, property_id=None):
+    """
+    Find the data coordinator of a property
+    :param hass: home assistant object
+    :param property_id: MPxN, may be omitted when a single property is set up
+    :return: data coordinator
+    """
+    coordinators = list(hass.data[DOMAIN][DATA_COORDINATOR].values())
+    if not coordinators:
+        raise HomeAssistantError("No property is set up")
+    if property_id is None:
+        if len(coordinators) == 1:
+            return coordinators[0]
+        raise HomeAssistantError("Several properties are set up, the property id must be given")
+
+    for coordinator in coordinators:
+        if coordinator.api.mpxn == property_id:
+            return coordinator
+    raise HomeAssistantError(f"Property {property_id} is not set up")
+
+
 async def async_setup_entry(hass, config_entry):
     """
     Set up n3rgy component from a config entry
@@ -36,9 +145,21 @@ async def async_setup_entry(hass, config_entry):
     :param config_entry: config entry
     :return: true if successful
     """
+    # entries created before several properties were supported have no unique id
+    if config_entry.unique_id is None and config_entry.data:
+        hass.config_entries.async_update_entry(config_entry, unique_id=config_entry.data.get(CONF_PROPERTY_ID))
+
     # update options
     hass.data[DOMAIN][DATA_LISTENER][config_entry.entry_id] = config_entry.add_update_listener(async_reload_entry)
-    
+
+    # api clients of every entry share one connection pool and one request scheduler
+    hass.data[DOMAIN][DATA_CLIENT][config_entry.entry_id] = init_api_client(
+        config_entry, hass.data[DOMAIN][DATA_SCHEDULER], async_get_session(hass)
+    )
+
+    # reading archive is shared by all entries
+    await async_open_archive(hass)
+
     # add sensor
     hass.async_create_task(
         hass.config_entries.async_forward_entry_setup(config_entry, PLATFORM)
@@ -58,6 +179,14 @@ async def async_unload_entry(hass, config_entry):
         await hass.config_entries.async_forward_entry_unload(config_entry, PLATFORM)
         remove_listener = hass.data[DOMAIN][DATA_LISTENER].pop(config_entry.entry_id)
         remove_listener()
+        hass.data[DOMAIN][DATA_COORDINATOR].pop(config_entry.entry_id, None)
+
+        # close pooled connections once the last entry is gone
+        api = hass.data[DOMAIN][DATA_CLIENT].pop(config_entry.entry_id, None)
+        if api is not None:
+            await api.close()
+        if not hass.data[DOMAIN][DATA_CLIENT]:
+            await async_close_session(hass)
         _LOGGER.debug("Successfully removed sensor from the n3rgy integration!")
         return True
     except ValueError as ex:
@@ -74,3 +203,113 @@ async def async_reload_entry(hass, config_entry):
     """
     await hass.config_entries.async_reload(config_entry.entry_id)
     _LOGGER.debug("Options parameter updated!")
+
+
+def init_api_client(config_entry, scheduler=None, session=None):
+    """
+    Initialize n3rgy data API client
+    :param config_entry: config entry
+    :param scheduler: shared request scheduler
+    :param session: shared aiohttp client session
+    :return n3rgy data api client instance
+    """
+    # read the configuration data
+    host = None
+    api_key = None
+    property_id = None
+    pool_size = DEFAULT_POOL_SIZE
+    timeout = DEFAULT_TIMEOUT
+    concurrency = DEFAULT_CONCURRENCY
+
+    # check the input data
+    if config_entry.data:
+        host = config_entry.data.get(CONF_HOST)
+        api_key = config_entry.data.get(CONF_API_KEY)
+        property_id = config_entry.data.get(CONF_PROPERTY_ID)
+
+    # check options
+    if config_entry.options:
+        pool_size = config_entry.options.get(CONF_POOL_SIZE, DEFAULT_POOL_SIZE)
+        timeout = config_entry.options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        concurrency = config_entry.options.get(CONF_CONCURRENCY, DEFAULT_CONCURRENCY)
+
+    # initialize n3rgy data API client
+    api_instance = None
+    try:
+        api_instance = N3rgyAsyncDataApi(
+            host, api_key, property_id, session=session, pool_size=pool_size, timeout=timeout,
+            concurrency=concurrency, scheduler=scheduler
+        )
+    except ValueError as err:
+        _LOGGER.warning(f"[INIT_API_CLIENT] Error: {str(err)}")
+    finally:
+        return api_instance
+
+
+def async_get_session(hass):
+    """
+    Return the connection pool shared by the clients of every entry, creating it on first use
+    The pool is sized for the largest pool size configured across the entries
+    :param hass: home assistant object
+    :return: aiohttp client session
+    """
+    session = hass.data[DOMAIN].get(DATA_SESSION)
+    if session is not None and not session.closed:
+        return session
+
+    pool_size = max(
+        [entry.options.get(CONF_POOL_SIZE, DEFAULT_POOL_SIZE) for entry in hass.config_entries.async_entries(DOMAIN)],
+        default=DEFAULT_POOL_SIZE
+    )
+    session = create_async_session(pool_size)
+    hass.data[DOMAIN][DATA_SESSION] = session
+
+    async def async_stop_session(event):
+        """
+        Close the shared connection pool when home assistant stops
+        :param event: stop event
+        :return: none
+        """
+        await async_close_session(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_session)
+    return session
+
+
+async def async_close_session(hass):
+    """
+    Close the shared connection pool
+    :param hass: home assistant object
+    :return: none
+    """
+    session = hass.data[DOMAIN].pop(DATA_SESSION, None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def async_open_archive(hass):
+    """
+    Open the local reading archive under the config directory
+    The archive segments cache is shared by every entry, so its memory budget holds for the whole fleet
+    :param hass: home assistant object
+    :return: archive instance
+    """
+    archive = hass.data[DOMAIN].get(DATA_ARCHIVE)
+    if archive is not None:
+        return archive
+
+    archive = N3rgyArchive(hass.config.path(ARCHIVE_FILE))
+    hass.data[DOMAIN][DATA_ARCHIVE] = archive
+    hass.data[DOMAIN][DATA_SEGMENTS] = SegmentCache(hass, archive)
+    await hass.async_add_executor_job(archive.open)
+
+    async def async_close_archive(event):
+        """
+        Close the archive when home assistant stops
+        :param event: stop event
+        :return: none
+        """
+        await hass.async_add_executor_job(archive.close)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_close_archive)
+    return archive
@@ -0,0 +1,181 @@
+"""
+Script file: archive.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Local persistent time-series archive for n3rgy readings
+"""
+
+import logging
+import sqlite3
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class N3rgyArchive:
+    """
+    On-disk store of half-hourly readings keyed by MPxN, utility, reading type and timestamp.
+    Rows are only ever inserted or overwritten, every write is committed atomically in a
+    write-ahead log and the primary key doubles as the time index for range reads.
+    All methods are blocking and must run in the executor.
+    """
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS readings ("
+        "mpxn TEXT NOT NULL, "
+        "utility TEXT NOT NULL, "
+        "reading_type TEXT NOT NULL, "
+        "minute INTEGER NOT NULL, "
+        "value REAL, "
+        "PRIMARY KEY (mpxn, utility, reading_type, minute)"
+        ") WITHOUT ROWID",
+        "CREATE TABLE IF NOT EXISTS units ("
+        "mpxn TEXT NOT NULL, "
+        "utility TEXT NOT NULL, "
+        "reading_type TEXT NOT NULL, "
+        "unit TEXT, "
+        "PRIMARY KEY (mpxn, utility, reading_type)"
+        ") WITHOUT ROWID"
+    ]
+
+    def __init__(self, path):
+        """
+        Initialize the archive
+        :param path: database file path
+        :return: none
+        """
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        """
+        Open (and create if needed) the archive database
+        :param: none
+        :return: none
+        """
+        with self._lock:
+            self._connect()
+
+    def _connect(self):
+        """
+        Connect to the database unless already connected, the lock must be held
+        :param: none
+        :return: database connection
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._conn = conn
+            _LOGGER.debug(f"[ARCHIVE] Opened {self.path}")
+        return self._conn
+
+    def close(self):
+        """
+        Close the archive database
+        :param: none
+        :return: none
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def append(self, key, rows):
+        """
+        Write readings of a series in a single transaction
+        :param key: series key (mpxn, utility, reading type)
+        :param rows: iterable of (epoch minute, value)
+        :return: number of rows written
+        """
+        records = [(*key, minute, value) for minute, value in rows]
+        if not records:
+            return 0
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO readings (mpxn, utility, reading_type, minute, value) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    records
+                )
+        return len(records)
+
+    def read_range(self, key, start, end):
+        """
+        Read the readings of a series within a time range
+        :param key: series key (mpxn, utility, reading type)
+        :param start: first epoch minute (inclusive)
+        :param end: last epoch minute (inclusive)
+        :return: list of (epoch minute, value) ordered by time
+        """
+        with self._lock:
+            cursor = self._connect().execute(
+                "SELECT minute, value FROM readings "
+                "WHERE mpxn = ? AND utility = ? AND reading_type = ? AND minute BETWEEN ? AND ? "
+                "ORDER BY minute",
+                (*key, start, end)
+            )
+            return cursor.fetchall()
+
+    def first_minute(self, key):
+        """
+        Return the oldest stored reading of a series
+        :param key: series key (mpxn, utility, reading type)
+        :return: epoch minute or None
+        """
+        with self._lock:
+            cursor = self._connect().execute(
+                "SELECT MIN(minute) FROM readings WHERE mpxn = ? AND utility = ? AND reading_type = ?",
+                key
+            )
+            return cursor.fetchone()[0]
+
+    def last_minute(self, key):
+        """
+        Return the newest stored reading of a series
+        :param key: series key (mpxn, utility, reading type)
+        :return: epoch minute or None
+        """
+        with self._lock:
+            cursor = self._connect().execute(
+                "SELECT MAX(minute) FROM readings WHERE mpxn = ? AND utility = ? AND reading_type = ?",
+                key
+            )
+            return cursor.fetchone()[0]
+
+    def write_unit(self, key, unit):
+        """
+        Store the unit of measurement of a series
+        :param key: series key (mpxn, utility, reading type)
+        :param unit: unit of measurement
+        :return: none
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO units (mpxn, utility, reading_type, unit) VALUES (?, ?, ?, ?)",
+                    (*key, unit)
+                )
+
+    def read_unit(self, key):
+        """
+        Return the stored unit of measurement of a series
+        :param key: series key (mpxn, utility, reading type)
+        :return: unit of measurement or None
+        """
+        with self._lock:
+            cursor = self._connect().execute(
+                "SELECT unit FROM units WHERE mpxn = ? AND utility = ? AND reading_type = ?",
+                key
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
@@ -0,0 +1,174 @@
+"""
+Script file: backfill.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Background historical backfill for the n3rgy data integration
+"""
+
+import asyncio
+import logging
+
+from datetime import datetime
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    SLOT_MINUTES,
+    INPUT_DATETIME_FORMAT,
+    BACKFILL_CHUNK_DAYS,
+    BACKFILL_DELAY,
+    BACKFILL_RETRY_DELAY,
+    BACKFILL_MAX_RETRIES,
+    BACKFILL_MIN_TOKENS
+)
+from .series import as_series, to_epoch_minute, from_epoch_minute
+from .coordinator import get_window
+from .rollup import MINUTES_PER_DAY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_cache_start(data):
+    """
+    Return the start of the cache range the API reports for a series
+    :param data: response data
+    :return: epoch minute or None
+    """
+    try:
+        start = data['availableCacheRange']['start']
+        return to_epoch_minute(datetime.strptime(start, INPUT_DATETIME_FORMAT))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class N3rgyBackfill:
+    """
+    Low priority task filling the archive with the history of every series.
+    It walks back from the oldest archived reading in bounded chunks until the meter has no older data.
+    The position of each series is checkpointed after every chunk, so a restart resumes where it stopped.
+    A chunk is only requested while no refresh runs and the rate limiter has tokens to spare.
+    A series whose chunk keeps failing is skipped until the next start.
+    """
+
+    def __init__(self, hass, coordinator, chunk_days=BACKFILL_CHUNK_DAYS, delay=BACKFILL_DELAY):
+        """
+        Initialize the backfill
+        :param hass: hass object
+        :param coordinator: n3rgy data coordinator
+        :param chunk_days: days requested per chunk
+        :param delay: seconds between chunks
+        :return: none
+        """
+        self.hass = hass
+        self.coordinator = coordinator
+        self.api = coordinator.api
+        self.archive = coordinator.archive
+        self.chunk = chunk_days * MINUTES_PER_DAY
+        self.delay = delay
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.backfill.{self.api.mpxn}")
+        self._checkpoints = None
+        self._failures = {}
+        self._task = None
+
+    def start(self):
+        """
+        Start the backfill task
+        :param: none
+        :return: none
+        """
+        if self.archive is None or self._task is not None:
+            return
+        self._task = self.hass.async_create_task(self.async_run())
+
+    def stop(self):
+        """
+        Cancel the backfill task
+        :param: none
+        :return: none
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def async_run(self):
+        """
+        Backfill every series in turn
+        :param: none
+        :return: none
+        """
+        self._checkpoints = await self._store.async_load() or {}
+        try:
+            for utility, reading_type in await self.coordinator.async_discover():
+                key = (self.api.mpxn, utility, reading_type)
+                while not await self.async_backfill_chunk(key):
+                    await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            _LOGGER.debug("[BACKFILL] Stopped")
+            raise
+        _LOGGER.info("[BACKFILL] Complete")
+
+    async def _async_wait_idle(self):
+        """
+        Wait until no refresh runs and the rate limiter has tokens to spare
+        :param: none
+        :return: none
+        """
+        while self.coordinator.refreshing or not self.api.scheduler.idle(BACKFILL_MIN_TOKENS):
+            await asyncio.sleep(self.delay)
+
+    async def async_backfill_chunk(self, key):
+        """
+        Fetch the chunk preceding the checkpoint of a series into the archive
+        :param key: series key (mpxn, utility, reading type)
+        :return: true once the series is complete
+        """
+        name = f"{key[1]}/{key[2]}"
+        checkpoint = self._checkpoints.get(name)
+        if checkpoint is None:
+            cursor = await self.hass.async_add_executor_job(self.archive.first_minute, key)
+            if cursor is None:
+                cursor = to_epoch_minute(get_window(self.coordinator.config_entry)[0])
+            checkpoint = {'cursor': cursor, 'done': False}
+        if checkpoint['done']:
+            return True
+
+        end = checkpoint['cursor'] - SLOT_MINUTES
+        start = checkpoint['cursor'] - self.chunk
+        str_start = datetime.strftime(from_epoch_minute(start), INPUT_DATETIME_FORMAT)
+        str_end = datetime.strftime(from_epoch_minute(end), INPUT_DATETIME_FORMAT)
+
+        await self._async_wait_idle()
+        try:
+            data = await self.coordinator.readers[key[2]](key[1], str_start, str_end)
+        except ValueError as err:
+            _LOGGER.warning(f"[BACKFILL] Error: {str(err)}")
+            data = None
+
+        # failed request, try again later from the same checkpoint
+        if not isinstance(data, dict):
+            failures = self._failures.get(name, 0) + 1
+            self._failures[name] = failures
+            if failures >= BACKFILL_MAX_RETRIES:
+                _LOGGER.warning(f"[BACKFILL] {name} ({str_start}-{str_end}) failed {failures} times, skipped until restart")
+                return True
+            _LOGGER.debug(f"[BACKFILL] {name} ({str_start}-{str_end}) failed, retrying later")
+            await asyncio.sleep(BACKFILL_RETRY_DELAY)
+            return False
+        self._failures.pop(name, None)
+
+        series = as_series(data).slice(start, end)
+        if series:
+            await self.coordinator.async_append_archive(key, list(series.items()))
+
+        # the meter has nothing older than this chunk, an empty chunk only ends the walk
+        # when the response does not say how far back the meter data goes
+        cache_start = get_cache_start(data)
+        done = not series if cache_start is None else cache_start >= start
+
+        self._checkpoints[name] = {'cursor': start, 'done': done}
+        await self._store.async_save(self._checkpoints)
+        _LOGGER.debug(f"[BACKFILL] {name} ({str_start}-{str_end}): {len(series)} readings")
+        return done
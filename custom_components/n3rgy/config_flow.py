@@ -1,7 +1,7 @@
 """
 Script file: config_flow.py
 Created on: Jan 31, 2021
-Last modified on: Feb 20, 2021
+Last modified on: Oct 17, 2026
 
 Comments:
     Config flow for n3rgy data
@@ -24,8 +24,18 @@ from .const import (
     CONF_UTILITY,
     CONF_START,
     CONF_END,
+    CONF_POOL_SIZE,
+    CONF_TIMEOUT,
+    CONF_CONCURRENCY,
+    CONF_BACKFILL,
+    CONF_HOT_DAYS,
     DEFAULT_NAME,
     DEFAULT_HOST,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_BACKFILL,
+    DEFAULT_HOT_DAYS,
     UTILITY_ELECTRICITY,
     UTILITY_GAS,
     DOMAIN
@@ -48,10 +58,11 @@ class N3rgyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """
         errors = {}
 
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
-
         if user_input is not None:
+            # one entry per property, any number of properties
+            await self.async_set_unique_id(user_input[CONF_PROPERTY_ID])
+            self._abort_if_unique_id_configured()
+
             try:
                 return self.async_create_entry(
                     title=user_input[CONF_NAME],
@@ -138,7 +149,12 @@ class N3rgyOptionsFlow(config_entries.OptionsFlow):
             vol.Optional(CONF_DAILY_UPDATE, default=self.config_entry.options.get(CONF_DAILY_UPDATE)): bool,
             vol.Optional(CONF_UTILITY, default=self.config_entry.options.get(CONF_UTILITY)): vol.In([UTILITY_ELECTRICITY, UTILITY_GAS]),
             vol.Optional(CONF_START, default=self.config_entry.options.get(CONF_START)): str,
-            vol.Optional(CONF_END, default=self.config_entry.options.get(CONF_END)): str
+            vol.Optional(CONF_END, default=self.config_entry.options.get(CONF_END)): str,
+            vol.Optional(CONF_POOL_SIZE, default=self.config_entry.options.get(CONF_POOL_SIZE, DEFAULT_POOL_SIZE)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_TIMEOUT, default=self.config_entry.options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_CONCURRENCY, default=self.config_entry.options.get(CONF_CONCURRENCY, DEFAULT_CONCURRENCY)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_BACKFILL, default=self.config_entry.options.get(CONF_BACKFILL, DEFAULT_BACKFILL)): bool,
+            vol.Optional(CONF_HOT_DAYS, default=self.config_entry.options.get(CONF_HOT_DAYS, DEFAULT_HOT_DAYS)): vol.All(vol.Coerce(int), vol.Range(min=1))
         }
 
         return self.async_show_form(
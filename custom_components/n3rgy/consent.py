@@ -0,0 +1,106 @@
+"""
+Script file: consent.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Persisted grant consent for the n3rgy data integration
+"""
+
+import time
+import logging
+
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    DEFAULT_CONSENT_TTL,
+    CONSENT_TYPE,
+    CONSENT_RETURN_URL
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_consent_urls(live_env):
+    """
+    Return the consent and handover base URLs of an environment
+    :param live_env: true for the live environment, false for the sandbox
+    :return: (consent token base url, handover base url)
+    """
+    if live_env:
+        return ('https://consent.data.n3rgy.com', 'https://portal-consent.data.n3rgy.com')
+    return ('https://consentsandbox.data.n3rgy.com', 'https://portal-consent-sandbox.data.n3rgy.com/')
+
+
+class N3rgyConsent:
+    """
+    Grant consent of one property, persisted in the Home Assistant storage.
+    A granted consent is reused across restarts and reloads until it expires,
+    or earlier when the data api refuses access to the meter.
+    """
+
+    def __init__(self, hass, consent, live_env, ttl=DEFAULT_CONSENT_TTL):
+        """
+        Initialize the grant consent
+        :param hass: hass object
+        :param consent: n3rgy async grant consent client
+        :param live_env: true for the live environment
+        :param ttl: seconds a granted consent is trusted
+        :return: none
+        """
+        self.hass = hass
+        self.consent = consent
+        self.live_env = live_env
+        self.ttl = ttl
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.consent.{consent.mpxn}")
+        self._record = None
+
+    @property
+    def granted(self):
+        """
+        Return whether a granted consent is held and has not expired
+        :param: none
+        :return: true if granted
+        """
+        return bool(self._record) and self._record['expires'] > time.time()
+
+    async def async_ensure(self):
+        """
+        Run the consent handshake unless a granted consent is already held
+        :param: none
+        :return: True if successful, False otherwise
+        """
+        if self._record is None:
+            self._record = await self._store.async_load() or {}
+        if self.granted:
+            _LOGGER.debug(f"[CONSENT] Reusing session {self._record['session_id']}")
+            return True
+
+        consent_token_base_url, handover_base_url = get_consent_urls(self.live_env)
+        session_id = await self.consent.get_operation_authorization_token(consent_token_base_url)
+        if not session_id:
+            return False
+
+        # define return/error url to be redirected
+        if not await self.consent.invocation_endpoint_url(
+            handover_base_url, session_id, CONSENT_TYPE, CONSENT_RETURN_URL, CONSENT_RETURN_URL
+        ):
+            return False
+
+        now = time.time()
+        self._record = {'session_id': session_id, 'granted': now, 'expires': now + self.ttl}
+        await self._store.async_save(self._record)
+        return True
+
+    async def async_renew(self):
+        """
+        Drop the held consent and run the handshake again
+        :param: none
+        :return: True if successful, False otherwise
+        """
+        _LOGGER.info("[CONSENT] Access lapsed, renewing the grant consent")
+        self._record = {}
+        await self._store.async_remove()
+        return await self.async_ensure()
@@ -1,7 +1,7 @@
 """
 Script file: const.py
 Created on: Jan 29, 2021
-Last modified on: Feb 20, 2021
+Last modified on: Oct 17, 2026
 
 Comments:
     Constants for the n3rgy data integration
@@ -9,6 +9,12 @@ Comments:
 
 DOMAIN = "n3rgy"
 DATA_LISTENER = "listener"
+DATA_CLIENT = "client"
+DATA_SCHEDULER = "scheduler"
+DATA_ARCHIVE = "archive"
+DATA_SESSION = "session"
+DATA_COORDINATOR = "coordinator"
+DATA_SEGMENTS = "segments"
 
 # config options
 CONF_PROPERTY_ID = "property_id"
@@ -17,13 +23,32 @@ CONF_DAILY_UPDATE = "daily_update"
 CONF_UTILITY = "utility"
 CONF_START = "start"
 CONF_END = "end"
+CONF_POOL_SIZE = "pool_size"
+CONF_TIMEOUT = "timeout"
+CONF_CONCURRENCY = "concurrency"
+CONF_BACKFILL = "backfill"
+CONF_HOT_DAYS = "hot_days"
+
+# query service
+SERVICE_QUERY = "query"
+CONF_READING_TYPE = "reading_type"
+CONF_GRANULARITY = "granularity"
+GRANULARITY_HALFHOUR = "halfhour"
+GRANULARITY_DAY = "day"
+GRANULARITY_WEEK = "week"
+GRANULARITY_MONTH = "month"
+QUERY_MAX_FETCHES = 8
 
 # properties
 PLATFORM = "sensor"
 ATTRIBUTION = "Energy consumption data from https://data.n3rgy.com, delivered by n3rgy data Ltd."
 SENSOR_NAME = "data"
 SENSOR_TYPE = "usage"
+SENSOR_TYPE_COST = "cost"
 ICON = "mdi:flash"
+ICON_COST = "mdi:currency-gbp"
+COST_UNIT = "GBP"
+PENCE_PER_POUND = 100
 
 # default values
 DEFAULT_NAME = "n3rgy"
@@ -34,13 +59,115 @@ DEFAULT_DEVICE_TYPE = "Not specified"
 UTILITY_ELECTRICITY = "electricity"
 UTILITY_GAS = "gas"
 
+# local reading archive
+ARCHIVE_FILE = "n3rgy_archive.db"
+
+# polling scheduler (seconds, window in minutes)
+DEFAULT_POLL_INTERVAL = 1800
+MAX_POLL_INTERVAL = 6 * 3600
+DENSE_POLL_INTERVAL = 600
+ARRIVAL_WINDOW = 60
+ARRIVAL_HISTORY = 14
+
+# the polls of several meters are spread over this many seconds
+POLL_STAGGER = DEFAULT_POLL_INTERVAL
+
+# request scheduler
+DEFAULT_RATE_LIMIT = 2
+DEFAULT_BURST = 10
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 1
+RETRY_BACKOFF_MAX = 60
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 300
+
+# performance metrics, histogram buckets in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+METRIC_SENSORS = {
+    'latency_p95': ("API latency p95", "ms", "mdi:timer-outline"),
+    'requests': ("API requests", None, "mdi:swap-vertical"),
+    'errors': ("API errors", None, "mdi:alert-circle-outline"),
+    'retries': ("API retries", None, "mdi:refresh"),
+    'cache_hit_ratio': ("Cache hit ratio", "%", "mdi:database-check"),
+    'refresh_duration': ("Refresh duration", "ms", "mdi:timer-sand")
+}
+
+# long-term statistics, days searched back for the sum preceding a late slot
+STATISTICS_LOOKBACK = 31
+
+# historical backfill, delays in seconds
+DEFAULT_BACKFILL = True
+BACKFILL_CHUNK_DAYS = 30
+BACKFILL_DELAY = 60
+BACKFILL_RETRY_DELAY = 900
+BACKFILL_MAX_RETRIES = 8
+BACKFILL_MIN_TOKENS = 5
+
+# gap re-fetch, intervals in seconds
+GAP_RETRY_INTERVAL = 6 * 3600
+GAP_RETRY_MAX = 7 * 24 * 3600
+GAP_JOIN_SLOTS = 4
+GAP_MAX_FETCHES = 4
+
+# persistent storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+# metadata cache
+DEFAULT_METADATA_TTL = 7 * 24 * 3600
+
+# grant consent, renewed early when the api reports that access lapsed
+DEFAULT_CONSENT_TTL = 30 * 24 * 3600
+CONSENT_TYPE = "ihdmac_full"
+CONSENT_RETURN_URL = "https://cloudkb.co.uk"
+
+# http connection pool
+DEFAULT_POOL_SIZE = 10
+DEFAULT_KEEPALIVE = 60
+DEFAULT_TIMEOUT = 30
+
+# ranged requests
+DEFAULT_CHUNK_DAYS = 30
+DEFAULT_CONCURRENCY = 4
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# seconds a finished response is served to identical requests, 0 to only share requests in flight
+DEFAULT_RESULT_TTL = 0
+
+# reading types
+READING_TYPE_CONSUMPTION = "consumption"
+READING_TYPE_PRODUCTION = "production"
+READING_TYPE_TARIFF = "tariff"
+READING_TYPE_STANDING_CHARGE = "standing_charge"
+
+# tiered series store: days kept in memory per series, older slots are read back from archive segments
+DEFAULT_HOT_DAYS = 62
+SEGMENT_DAYS = 30
+SEGMENT_CACHE_BUDGET = 4 * 1024 * 1024
+
+# half-hourly reading slot (minutes)
+SLOT_MINUTES = 30
+
+# rollups
+DEFAULT_BASE_LOAD_SLOTS = 4
+DEFAULT_PERCENTILES = (10, 50, 90)
+
 # attributes
 ATTR_START_DATETIME = "Start datetime"
 ATTR_END_DATETIME = "End datetime"
 ATTR_DEVICE_TYPE = "Smart meter type"
+ATTR_PEAK = "Peak half-hour"
+ATTR_PEAK_DATETIME = "Peak half-hour datetime"
+ATTR_BASE_LOAD = "Base load"
+ATTR_ENERGY_COST = "Energy cost"
+ATTR_STANDING_CHARGE = "Standing charge"
+ATTR_MISSING_SLOTS = "Missing slots"
 
 # date/time formatter
 INPUT_DATETIME_FORMAT = "%Y%m%d%H%M"
+READING_DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+TARIFF_DATE_FORMAT = "%Y-%m-%d"
 ATTR_DATETIME_FORMAT = "%m/%d/%Y %H:%M"
 
 # debug flag
@@ -0,0 +1,670 @@
+"""
+Script file: coordinator.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Data update coordinator for the n3rgy data integration
+"""
+
+import time
+import asyncio
+import logging
+
+from datetime import datetime, timedelta
+from homeassistant.const import CONF_NAME
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import (
+    CONF_DAILY_UPDATE,
+    CONF_UTILITY,
+    CONF_START,
+    CONF_END,
+    CONF_HOT_DAYS,
+
+    PLATFORM,
+    DEFAULT_NAME,
+    DEFAULT_DAILY_UPDATE,
+    UTILITY_ELECTRICITY,
+    READING_TYPE_CONSUMPTION,
+    READING_TYPE_PRODUCTION,
+    READING_TYPE_TARIFF,
+    READING_TYPE_STANDING_CHARGE,
+    DEFAULT_POLL_INTERVAL,
+    SLOT_MINUTES,
+    GAP_MAX_FETCHES,
+    DEFAULT_HOT_DAYS,
+
+    INPUT_DATETIME_FORMAT
+)
+from .series import ReadingSeries, as_series, to_epoch_minute, from_epoch_minute
+from .rollup import MINUTES_PER_DAY, compute_rollups
+from .tariff import TariffTable, parse_tariff, compute_costs
+from .metadata import N3rgyMetadataCache
+from .polling import ArrivalScheduler, get_stagger
+from .statistics import async_import_statistics
+from .gaps import GapIndex, find_gaps
+from .snapshot import build_snapshots
+from .store import SegmentCache, series_bytes, summarize, merge_cold
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_window(config_entry, now=None):
+    """
+    Resolve the reading window configured for an entry
+    Without an explicit start/end (or with daily update enabled) the window is the whole previous day
+    :param config_entry: config entry
+    :param now: current local date/time, defaults to now
+    :return: (start, end) date/time objects
+    """
+    daily_update = DEFAULT_DAILY_UPDATE
+    start = None
+    end = None
+
+    # check options
+    if config_entry.options:
+        daily_update = config_entry.options.get(CONF_DAILY_UPDATE)
+        if not daily_update:
+            start = config_entry.options.get(CONF_START)
+            end = config_entry.options.get(CONF_END)
+
+    # explicit window
+    if start and end:
+        try:
+            return (datetime.strptime(start, INPUT_DATETIME_FORMAT), datetime.strptime(end, INPUT_DATETIME_FORMAT))
+        except ValueError as err:
+            _LOGGER.warning(f"[GET_WINDOW] Invalid window, using the previous day: {str(err)}")
+
+    # previous day
+    if now is None:
+        now = datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return (today - timedelta(days=1), today - timedelta(minutes=1))
+
+
+def get_entries(data):
+    """
+    Return the `entries` list of an n3rgy discovery response
+    :param data: response data
+    :return: list of entries
+    """
+    if isinstance(data, dict) and isinstance(data.get('entries'), list):
+        return data['entries']
+    return []
+
+
+class N3rgyDataCoordinator(DataUpdateCoordinator):
+    """
+    Fetch n3rgy readings incrementally.
+    Readings are held as columnar ReadingSeries built once per fetch.
+    A high-water mark is kept per MPxN, utility and reading type so that every refresh only requests
+    the half-hours newer than the last stored reading and merges them into the dataset already held.
+    Each window is seeded from the local archive first and every new slot is written back to it.
+    New slots are also imported into the long-term statistics as hourly totals.
+    Missing slots below the high-water mark are tracked and re-fetched on a slow retry schedule.
+    With an archive, only the most recent days of a window (the hot window) are held in memory.
+    Older slots are evicted and summarized from the archive segments for the window totals.
+    """
+
+    def __init__(self, hass, api, config_entry, archive=None, metadata=None, consent=None, segments=None):
+        """
+        Initialize n3rgy data coordinator
+        :param hass: hass object
+        :param api: n3rgy async api client
+        :param config_entry: config entry
+        :param archive: local reading archive
+        :param metadata: metadata cache
+        :param consent: persisted grant consent, renewed when the api reports that access lapsed
+        :param segments: archive segment cache, a private one is created if omitted
+        :return: none
+        """
+        super().__init__(hass, _LOGGER, name=PLATFORM, update_interval=timedelta(seconds=DEFAULT_POLL_INTERVAL))
+        self.api = api
+        self.config_entry = config_entry
+        self.archive = archive
+        self.metadata = metadata if metadata is not None else N3rgyMetadataCache(hass, api)
+        self.consent = consent
+        self.segments = segments
+        if segments is None and archive is not None:
+            self.segments = SegmentCache(hass, archive)
+
+        # per series state, keyed by (mpxn, utility, reading type)
+        self._high_water = {}
+        self._series = {}
+        self._units = {}
+        self._loaded = {}
+        self._imported = set()
+
+        # summaries and gaps of the slots evicted from memory, and the number of evicted slots
+        self._cold = {}
+        self._cold_gaps = {}
+        self.evicted = 0
+
+        # missing slots per series
+        self.gaps = GapIndex()
+
+        # tariff tables per utility, cached with the window they were built for
+        self._tariff = {}
+
+        # discovered (utility, reading type) series
+        self.series_keys = None
+
+        # set while a poll is fetching, background work waits for it
+        self.refreshing = False
+
+        # polls follow the data arrival pattern of the meter, offset from the other meters
+        self.scheduler = ArrivalScheduler(offset=get_stagger(api.mpxn))
+
+    @property
+    def utility(self):
+        """
+        Return the configured utility
+        :param: none
+        :return: utility type
+        """
+        if self.config_entry.options:
+            return self.config_entry.options.get(CONF_UTILITY) or UTILITY_ELECTRICITY
+        return UTILITY_ELECTRICITY
+
+    @property
+    def readers(self):
+        """
+        Return the api read method of each supported reading type
+        :param: none
+        :return: dict of reading type to read method
+        """
+        return {
+            READING_TYPE_CONSUMPTION: self.api.read_consumption,
+            READING_TYPE_PRODUCTION: self.api.read_export
+        }
+
+    def hot_start(self, start, end, last=None):
+        """
+        Return the first minute of a window held in memory
+        The hot window reaches back from the newest reading, so a window ending in the future keeps its data
+        Without an archive evicted slots could not be read back, so the whole window stays in memory
+        :param start: window start epoch minute
+        :param end: window end epoch minute
+        :param last: newest stored reading epoch minute
+        :return: epoch minute
+        """
+        if self.archive is None:
+            return start
+
+        days = DEFAULT_HOT_DAYS
+        if self.config_entry.options:
+            days = self.config_entry.options.get(CONF_HOT_DAYS) or DEFAULT_HOT_DAYS
+        if last is not None:
+            end = min(end, last)
+        hot_start = end - days * MINUTES_PER_DAY + 1
+        return max(start, hot_start - hot_start % SLOT_MINUTES)
+
+    def store_stats(self):
+        """
+        Return the memory use of the series held by the coordinator
+        :param: none
+        :return: dict
+        """
+        return {
+            'hot_slots': sum(len(series) for series in self._series.values()),
+            'hot_bytes': sum(series_bytes(series) for series in self._series.values()),
+            'evicted_slots': self.evicted,
+            'cold_series': len(self._cold),
+            'segments': self.segments.stats() if self.segments is not None else None
+        }
+
+    def local_series(self, key, start, end):
+        """
+        Return the readings of a series held in memory within a range
+        :param key: series key (mpxn, utility, reading type)
+        :param start: first epoch minute
+        :param end: last epoch minute
+        :return: (reading series, unit of measurement)
+        """
+        return (self._series.get(key, ReadingSeries()).slice(start, end), self._units.get(key))
+
+    async def async_discover(self):
+        """
+        Discover the utilities and reading types available for the property, once
+        Falls back to the configured utility consumption when discovery fails
+        :param: none
+        :return: list of (utility, reading type)
+        """
+        if self.series_keys is not None:
+            return self.series_keys
+
+        keys = []
+        utilities = get_entries(await self.metadata.async_get_utility_types())
+        if utilities:
+            reading_types = await asyncio.gather(*[self.metadata.async_get_reading_types(u) for u in utilities])
+            for utility, types in zip(utilities, reading_types):
+                keys.extend((utility, t) for t in get_entries(types) if t in self.readers)
+
+        if not keys:
+            _LOGGER.warning("[DISCOVER] No series discovered, using the configured utility")
+            return [(self.utility, READING_TYPE_CONSUMPTION)]
+
+        _LOGGER.debug(f"[DISCOVER] Series: {keys}")
+        self.series_keys = keys
+        return keys
+
+    async def _async_update_data(self):
+        """
+        Fetch data from n3rgy API
+        This is the place to pre-process the data to lookup tables so entities can quickly look up their data
+        All discovered series are fetched concurrently, the polling scheduler plans the next refresh
+        :param: none
+        :return: dict of (utility, reading type) to series data
+        """
+        now = datetime.now()
+        started = time.monotonic()
+        self.refreshing = True
+        try:
+            start, end = get_window(self.config_entry)
+            keys = await self.async_discover()
+            high_water = dict(self._high_water)
+            results = await asyncio.gather(*[self.async_update_series(key, start, end) for key in keys])
+        finally:
+            self.refreshing = False
+        self.api.metrics.record_refresh(time.monotonic() - started)
+
+        # the grant consent only runs again once the api refuses access
+        if self.api.consent_lapsed and self.consent is not None:
+            self.api.consent_lapsed = False
+            await self.consent.async_renew()
+
+        # plan the next poll from whether new half-hours arrived
+        self.update_interval = self.scheduler.record(now, self._high_water != high_water)
+        _LOGGER.debug(f"[SCHEDULER] Next poll at {self.scheduler.next_poll}")
+        return dict(zip(keys, results))
+
+    async def async_update_series(self, series_key, start, end):
+        """
+        Fetch one series and, for consumption, join it with the tariff of the same window
+        :param series_key: (utility, reading type)
+        :param start: window start date/time
+        :param end: window end date/time
+        :return: series data
+        """
+        utility, reading_type = series_key
+        key = (self.api.mpxn, utility, reading_type)
+        data = await self.async_fetch_incremental(key, self.readers[reading_type], start, end)
+
+        tariff = None
+        if data is not None and reading_type == READING_TYPE_CONSUMPTION:
+            tariff = await self.async_get_tariff(utility, start, end)
+            data['cost'] = compute_costs(data['series'], tariff)
+
+        if data is not None:
+            # the slots evicted from memory still count towards the window totals
+            cold = await self._async_cold_summary(key, start, end, tariff)
+            if cold is not None:
+                merge_cold(data, cold)
+            if not data['series'] and (cold is None or cold.first is None):
+                return None
+
+            # entities read their state, unit and attributes from the snapshots only
+            data['snapshots'] = build_snapshots(data)
+        return data
+
+    async def _async_cold_summary(self, key, start, end, tariff=None):
+        """
+        Summarize the slots of a window older than its hot window, from the archive segments
+        The summary is kept until the window, the hot window or the tariff move, or the archive changes
+        :param key: series key (mpxn, utility, reading type)
+        :param start: window start date/time
+        :param end: window end date/time
+        :param tariff: tariff table of the window
+        :return: cold summary or None
+        """
+        start_minute = to_epoch_minute(start)
+        hot_start = self.hot_start(start_minute, to_epoch_minute(end), self._high_water.get(key))
+        if self.segments is None or hot_start <= start_minute:
+            self._cold.pop(key, None)
+            return None
+
+        bounds = (start_minute, hot_start - SLOT_MINUTES)
+        cold = self._cold.get(key)
+        if cold is None or cold.bounds != bounds or cold.tariff is not tariff:
+            cold = summarize(await self.segments.async_read(key, *bounds), bounds, tariff)
+            self._cold[key] = cold
+        return cold
+
+    async def async_append_archive(self, key, rows):
+        """
+        Write readings of a series to the archive, dropping the cached copies they change
+        :param key: series key (mpxn, utility, reading type)
+        :param rows: list of (epoch minute, value)
+        :return: none
+        """
+        await self.hass.async_add_executor_job(self.archive.append, key, rows)
+        if self.segments is not None:
+            self.segments.invalidate(key, rows)
+
+        # the cached cold summary and gaps are rebuilt when the rows fall into their range
+        for cache in (self._cold, self._cold_gaps):
+            cached = cache.get(key)
+            if cached is None:
+                continue
+            first, last = cached[0]
+            if any(first <= minute <= last for minute, _ in rows):
+                del cache[key]
+
+    async def async_get_tariff(self, utility, start, end):
+        """
+        Return the tariff table of a window
+        The table is cached and only rebuilt when the window moves, from the archive when it covers the window
+        :param utility: utility type
+        :param start: window start date/time
+        :param end: window end date/time
+        :return: tariff table or None
+        """
+        window = (start, end)
+        cached = self._tariff.get(utility)
+        if cached is not None and cached[0] == window:
+            self.api.metrics.record_cache('tariff', True)
+            return cached[1]
+
+        start_minute = to_epoch_minute(start)
+        end_minute = to_epoch_minute(end)
+        price_key = (self.api.mpxn, utility, READING_TYPE_TARIFF)
+        charge_key = (self.api.mpxn, utility, READING_TYPE_STANDING_CHARGE)
+
+        # archived tariff
+        table = None
+        if self.archive is not None:
+            prices = await self.hass.async_add_executor_job(
+                self.archive.read_range, price_key, start_minute, end_minute
+            )
+            charges = await self.hass.async_add_executor_job(
+                self.archive.read_range, charge_key, start_minute - start_minute % MINUTES_PER_DAY, end_minute
+            )
+            table = TariffTable(ReadingSeries.from_pairs(prices), ReadingSeries.from_pairs(charges))
+            if not table.covers(start_minute, end_minute):
+                table = None
+
+        # fetch the tariff for the window
+        self.api.metrics.record_cache('tariff', table is not None)
+        if table is None:
+            str_start = datetime.strftime(start, INPUT_DATETIME_FORMAT)
+            str_end = datetime.strftime(end, INPUT_DATETIME_FORMAT)
+            try:
+                prices, charges = parse_tariff(await self.api.read_tariff(utility, str_start, str_end))
+            except ValueError as err:
+                _LOGGER.warning(f"[READ_TARIFF] Error: {str(err)}")
+                return None
+
+            if not prices:
+                return None
+
+            table = TariffTable(prices, charges)
+            if self.archive is not None:
+                await self.hass.async_add_executor_job(self.archive.append, price_key, list(prices.items()))
+                await self.hass.async_add_executor_job(self.archive.append, charge_key, list(charges.items()))
+
+        self._tariff[utility] = (window, table)
+        return table
+
+    async def async_fetch_incremental(self, key, read, start, end):
+        """
+        Request the slots of a series newer than its high-water mark and merge them into the stored dataset
+        When the window starts before the oldest stored reading, the slots in between are requested once as well
+        :param key: series key (mpxn, utility, reading type)
+        :param read: api read method taking (utility, start, end)
+        :param start: window start date/time
+        :param end: window end date/time
+        :return: merged series data for the window
+        """
+        start_minute = to_epoch_minute(start)
+        end_minute = to_epoch_minute(end)
+
+        # drop the slots that left the window
+        self._series[key] = self._series.get(key, ReadingSeries()).slice(start_minute, end_minute)
+
+        # seed the window from the archive
+        rows = []
+        if self._loaded.get(key) != (start, end):
+            await self._async_load_archive(key, start, end)
+
+            # the window was moved before the oldest stored reading
+            first = await self._async_first_minute(key)
+            if first is not None and start_minute < first <= end_minute:
+                rows = await self._async_fetch_range(
+                    key, read, start, from_epoch_minute(first - SLOT_MINUTES), start_minute, end_minute
+                )
+
+        # only ask for the half-hours newer than the last stored reading
+        high_water = self._high_water.get(key)
+        fetch_start = start
+        if high_water is not None and high_water >= start_minute:
+            fetch_start = from_epoch_minute(high_water + SLOT_MINUTES)
+
+        if fetch_start <= end:
+            rows = rows + await self._async_fetch_range(key, read, fetch_start, end, start_minute, end_minute)
+
+        # fill the holes left behind the high-water mark, over the whole window
+        rows = rows + await self._async_refetch_gaps(key, read, start_minute, end_minute)
+
+        # the first refresh also imports the archived slots the statistics do not have yet
+        if rows or key not in self._imported:
+            await self._async_import_statistics(key, rows, start_minute, end_minute)
+
+        # keep only the hot window in memory, older slots stay in the archive
+        hot_start = self.hot_start(start_minute, end_minute, self._high_water.get(key))
+        series = self._series[key]
+        if series and series.first_minute < hot_start:
+            self._series[key] = series.slice(hot_start, None)
+            self.evicted += len(series) - len(self._series[key])
+
+        return self._build_dataset(key, start, end)
+
+    async def _async_first_minute(self, key):
+        """
+        Return the oldest stored reading of a series
+        :param key: series key (mpxn, utility, reading type)
+        :return: epoch minute or None
+        """
+        if self.archive is not None:
+            return await self.hass.async_add_executor_job(self.archive.first_minute, key)
+        series = self._series[key]
+        return series.first_minute if series else None
+
+    async def _async_fetch_range(self, key, read, first, last, start, end):
+        """
+        Request a range of a series, merge it into the stored dataset and write the new slots to the archive
+        :param key: series key (mpxn, utility, reading type)
+        :param read: api read method taking (utility, start, end)
+        :param first: range start date/time
+        :param last: range end date/time
+        :param start: window start epoch minute
+        :param end: window end epoch minute
+        :return: list of new or changed (epoch minute, value) rows
+        """
+        str_start = datetime.strftime(first, INPUT_DATETIME_FORMAT)
+        str_end = datetime.strftime(last, INPUT_DATETIME_FORMAT)
+        rows = []
+        try:
+            data = await read(key[1], str_start, str_end)
+            _LOGGER.info(f"[READ_{key[2].upper()}] Grabbed data: ({str_start}-{str_end})")
+            unit = self._units.get(key)
+            rows = self._merge(key, data, start, end)
+            if self.archive is not None:
+                if rows:
+                    await self.async_append_archive(key, rows)
+                if self._units.get(key) != unit:
+                    await self.hass.async_add_executor_job(self.archive.write_unit, key, self._units[key])
+        except ValueError as err:
+            _LOGGER.warning(f"[READ_{key[2].upper()}] Error: {str(err)}")
+        return rows
+
+    async def _async_refetch_gaps(self, key, read, start, end):
+        """
+        Re-fetch the missing slot ranges of a series that are due for a retry
+        Gaps older than the hot window are re-fetched too, and written to the archive the cold summary is read from
+        :param key: series key (mpxn, utility, reading type)
+        :param read: api read method taking (utility, start, end)
+        :param start: window start epoch minute
+        :param end: window end epoch minute
+        :return: list of new (epoch minute, value) rows
+        """
+        high_water = self._high_water.get(key)
+        if high_water is None:
+            return []
+
+        now = datetime.now()
+        rows = []
+        self.gaps.update(key, await self._async_find_gaps(key, start, end), now)
+        for first, last in self.gaps.due(key, now, GAP_MAX_FETCHES):
+            self.gaps.attempted(key, (first, last), now)
+            str_start = datetime.strftime(from_epoch_minute(first), INPUT_DATETIME_FORMAT)
+            str_end = datetime.strftime(from_epoch_minute(last), INPUT_DATETIME_FORMAT)
+            try:
+                data = await read(key[1], str_start, str_end)
+            except ValueError as err:
+                _LOGGER.warning(f"[READ_{key[2].upper()}] Error: {str(err)}")
+                continue
+
+            changed = self._merge(key, data, first, last)
+            _LOGGER.debug(f"[GAPS] Re-fetched {key[2]} ({str_start}-{str_end}): {len(changed)} readings")
+            if changed and self.archive is not None:
+                await self.async_append_archive(key, changed)
+            rows.extend(changed)
+
+        if rows:
+            self.gaps.update(key, await self._async_find_gaps(key, start, end), now)
+        return rows
+
+    async def _async_find_gaps(self, key, start, end):
+        """
+        Find the missing slots of a series up to its high-water mark
+        The gaps of the hot window come from memory, the older ones from the archive segments
+        :param key: series key (mpxn, utility, reading type)
+        :param start: window start epoch minute
+        :param end: window end epoch minute
+        :return: list of (first, last) missing slot epoch minutes
+        """
+        high_water = self._high_water[key]
+        hot_start = self.hot_start(start, end, high_water)
+
+        gaps = []
+        if self.segments is not None and hot_start > start:
+            bounds = (start, hot_start - SLOT_MINUTES)
+            cached = self._cold_gaps.get(key)
+            if cached is None or cached[0] != bounds:
+                cached = (bounds, find_gaps(await self.segments.async_read(key, *bounds), *bounds))
+                self._cold_gaps[key] = cached
+            gaps = cached[1]
+        return gaps + find_gaps(self._series[key], hot_start, min(high_water, end))
+
+    async def _async_import_statistics(self, key, rows, start, end):
+        """
+        Import the new slots of a series into the long-term statistics
+        :param key: series key (mpxn, utility, reading type)
+        :param rows: list of new or changed (epoch minute, value) rows
+        :param start: window start epoch minute
+        :param end: window end epoch minute
+        :return: none
+        """
+        name = DEFAULT_NAME
+        if self.config_entry.data:
+            name = self.config_entry.data.get(CONF_NAME) or DEFAULT_NAME
+
+        # in-line function
+        async def async_read(first, last):
+            """
+            Read a range of the series, the slots older than the hot window from the archive segments
+            :param first: first epoch minute
+            :param last: last epoch minute
+            :return: reading series
+            """
+            held = self._series[key].slice(first, last)
+            hot_start = self.hot_start(start, end, self._high_water.get(key))
+            if self.segments is None or first >= hot_start:
+                return held
+            return (await self.segments.async_read(key, first, min(last, hot_start - 1))).merge(held)
+
+        try:
+            await async_import_statistics(
+                self.hass, key, f"{name} {key[1]} {key[2]}", self._units.get(key), async_read, rows, start, end
+            )
+            self._imported.add(key)
+        except Exception as err:
+            _LOGGER.warning(f"[STATISTICS] Import failed: {str(err)}")
+
+    async def _async_load_archive(self, key, start, end):
+        """
+        Load the archived readings of a series within the window
+        :param key: series key (mpxn, utility, reading type)
+        :param start: window start date/time
+        :param end: window end date/time
+        :return: none
+        """
+        self._loaded[key] = (start, end)
+        if self.archive is None:
+            return
+
+        start_minute = to_epoch_minute(start)
+        end_minute = to_epoch_minute(end)
+        last = await self.hass.async_add_executor_job(self.archive.last_minute, key)
+        rows = await self.hass.async_add_executor_job(
+            self.archive.read_range, key, self.hot_start(start_minute, end_minute, last), end_minute
+        )
+        if key not in self._units:
+            self._units[key] = await self.hass.async_add_executor_job(self.archive.read_unit, key)
+
+        series = self._series[key].merge(ReadingSeries.from_pairs(rows))
+        self._series[key] = series
+        if series:
+            self._high_water[key] = series.last_minute
+        _LOGGER.debug(f"[ARCHIVE] Loaded {len(rows)} {key[2]} readings")
+
+    def _merge(self, key, data, start, end):
+        """
+        Merge the values of an API response into the stored series and advance its high-water mark
+        :param key: series key (mpxn, utility, reading type)
+        :param data: API response
+        :param start: window start epoch minute
+        :param end: window end epoch minute
+        :return: list of new or changed (epoch minute, value) rows
+        """
+        if not isinstance(data, dict):
+            return []
+
+        if data.get('unit'):
+            self._units[key] = data['unit']
+
+        series = self._series[key]
+        update = as_series(data).slice(start, end)
+        rows = series.changed(update)
+        if rows:
+            series = series.merge(ReadingSeries.from_pairs(rows))
+            self._series[key] = series
+
+        if series:
+            self._high_water[key] = series.last_minute
+        return rows
+
+    def _build_dataset(self, key, start, end):
+        """
+        Build the series data handed to the entities
+        :param key: series key (mpxn, utility, reading type)
+        :param start: window start date/time
+        :param end: window end date/time
+        :return: series data, None if nothing was fetched yet
+        """
+        # the hot window may be empty while older slots of the window are in the archive
+        series = self._series.get(key)
+        start_minute = to_epoch_minute(start)
+        if not series and self.hot_start(start_minute, to_epoch_minute(end), self._high_water.get(key)) <= start_minute:
+            return None
+
+        return {
+            'start': datetime.strftime(start, INPUT_DATETIME_FORMAT),
+            'end': datetime.strftime(end, INPUT_DATETIME_FORMAT),
+            'unit': self._units.get(key),
+            'series': series,
+            'total': series.total(),
+            'rollups': compute_rollups(series),
+            'missing': self.gaps.missing(key)
+        }
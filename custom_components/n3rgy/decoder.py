@@ -0,0 +1,199 @@
+"""
+Script file: decoder.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    JSON decoding of n3rgy data API responses
+"""
+
+import re
+import json
+import codecs
+import logging
+
+from array import array
+
+from .series import ReadingSeries, parse_reading_minute
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# expected top-level layout of each kind of response
+SCHEMA_SERIES = {'values': list}
+SCHEMA_ENTRIES = {'entries': list}
+SCHEMA_DEVICE = {'deviceType': str}
+
+_WHITESPACE = ' \t\n\r'
+_VALUES_KEY = '"values"'
+_VALUES_RE = re.compile(r'"values"\s*:\s*\[')
+
+
+def loads(body):
+    """
+    Parse a JSON document straight from the response bytes, with orjson when it is installed
+    :param body: response body (bytes or str)
+    :return: parsed document
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def validate(data, schema):
+    """
+    Check a parsed document against the expected top-level layout
+    :param data: parsed document
+    :param schema: dict of required key to type
+    :return: true if valid
+    """
+    if not isinstance(data, dict):
+        return False
+    return all(isinstance(data.get(key), kind) for key, kind in schema.items())
+
+
+def decode(body, schema=None, tag=None):
+    """
+    Decode and validate a response body
+    :param body: response body (bytes or str)
+    :param schema: expected layout, not checked if None
+    :param tag: tag for debug
+    :return: parsed document, None if it cannot be parsed or does not match the schema
+    """
+    try:
+        data = loads(body)
+    except ValueError as err:
+        _LOGGER.warning(f"[{tag or 'DECODE'}] Invalid JSON response: {str(err)}")
+        return None
+
+    if schema is not None and not validate(data, schema):
+        _LOGGER.warning(f"[{tag or 'DECODE'}] Unexpected response layout")
+        return None
+    return data
+
+
+class SeriesStreamDecoder:
+    """
+    Incremental decoder for series responses.
+    Entries of the `values` array are decoded one by one as the body arrives and appended to
+    parallel arrays, the rest of the document is kept as text and parsed once at the end.
+    """
+
+    def __init__(self):
+        """
+        Initialize the stream decoder
+        :param: none
+        :return: none
+        """
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._scanner = json.JSONDecoder()
+        self._buffer = ''
+        self._head = []
+        self._state = 'head'
+        self._minutes = array('q')
+        self._values = array('d')
+        self._ordered = True
+
+    def feed(self, chunk):
+        """
+        Feed the next part of the body
+        :param chunk: bytes
+        :return: none
+        """
+        self._buffer += self._utf8.decode(chunk)
+        if self._state == 'head':
+            self._find_values()
+        if self._state == 'values':
+            self._read_values()
+
+    def _find_values(self):
+        """
+        Move the text preceding the `values` array into the head
+        :param: none
+        :return: none
+        """
+        match = _VALUES_RE.search(self._buffer)
+        if match:
+            self._head.append(self._buffer[:match.start()] + _VALUES_KEY + ':')
+            self._buffer = self._buffer[match.end():]
+            self._state = 'values'
+            return
+
+        # keep a possibly incomplete key at the end of the buffer
+        cut = self._buffer.rfind(_VALUES_KEY)
+        if cut < 0:
+            cut = max(0, len(self._buffer) - len(_VALUES_KEY))
+        self._head.append(self._buffer[:cut])
+        self._buffer = self._buffer[cut:]
+
+    def _read_values(self):
+        """
+        Decode every complete entry of the `values` array held in the buffer
+        :param: none
+        :return: none
+        """
+        buffer = self._buffer
+        index = 0
+        length = len(buffer)
+        while True:
+            while index < length and (buffer[index] in _WHITESPACE or buffer[index] == ','):
+                index += 1
+            if index >= length:
+                break
+            if buffer[index] == ']':
+                self._state = 'tail'
+                index += 1
+                break
+            try:
+                entry, index = self._scanner.raw_decode(buffer, index)
+            except ValueError:
+                # incomplete entry, wait for more data
+                break
+            self._append(entry)
+        self._buffer = buffer[index:]
+
+    def _append(self, entry):
+        """
+        Append a decoded entry to the arrays
+        :param entry: {'timestamp': ..., 'value': ...}
+        :return: none
+        """
+        try:
+            minute = parse_reading_minute(entry['timestamp'])
+            value = float(entry['value'])
+        except (KeyError, TypeError, ValueError):
+            return
+        if self._minutes and minute <= self._minutes[-1]:
+            self._ordered = False
+        self._minutes.append(minute)
+        self._values.append(value)
+
+    def close(self):
+        """
+        Finish decoding
+        :param: none
+        :return: response data with the decoded `series` instead of `values`, None if the body is not a series
+        """
+        self._buffer += self._utf8.decode(b'', final=True)
+        if self._state != 'tail':
+            _LOGGER.warning("[DECODE] Incomplete series response")
+            return None
+
+        try:
+            data = loads(''.join(self._head) + '[]' + self._buffer)
+        except ValueError as err:
+            _LOGGER.warning(f"[DECODE] Invalid JSON response: {str(err)}")
+            return None
+        if not validate(data, SCHEMA_SERIES):
+            return None
+
+        del data['values']
+        if self._ordered:
+            data['series'] = ReadingSeries(self._minutes, self._values)
+        else:
+            data['series'] = ReadingSeries.from_pairs(zip(self._minutes, self._values))
+        return data
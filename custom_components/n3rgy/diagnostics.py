@@ -0,0 +1,47 @@
+"""
+Script file: diagnostics.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Config entry diagnostics for the n3rgy data integration
+"""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_API_KEY
+
+from .const import (
+    DOMAIN,
+    DATA_CLIENT,
+    DATA_SCHEDULER,
+    DATA_COORDINATOR,
+    CONF_PROPERTY_ID
+)
+
+TO_REDACT = {CONF_API_KEY, CONF_PROPERTY_ID}
+
+
+async def async_get_config_entry_diagnostics(hass, config_entry):
+    """
+    Return the diagnostics of a config entry
+    :param hass: home assistant object
+    :param config_entry: config entry
+    :return: diagnostics data
+    """
+    api = hass.data[DOMAIN][DATA_CLIENT].get(config_entry.entry_id)
+    scheduler = hass.data[DOMAIN][DATA_SCHEDULER]
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR].get(config_entry.entry_id)
+
+    return {
+        'entry': {
+            'data': async_redact_data(dict(config_entry.data), TO_REDACT),
+            'options': dict(config_entry.options)
+        },
+        'scheduler': {
+            'circuit': scheduler.breaker.state,
+            'failures': scheduler.breaker.failures,
+            'tokens': round(scheduler.bucket.tokens, 2)
+        },
+        'metrics': api.metrics.as_dict() if api is not None else None,
+        'store': coordinator.store_stats() if coordinator is not None else None
+    }
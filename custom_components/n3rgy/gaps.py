@@ -0,0 +1,142 @@
+"""
+Script file: gaps.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Detection and re-fetch scheduling of missing half-hour slots
+"""
+
+from datetime import timedelta
+
+from .const import (
+    SLOT_MINUTES,
+    GAP_RETRY_INTERVAL,
+    GAP_RETRY_MAX,
+    GAP_JOIN_SLOTS
+)
+
+
+def find_gaps(series, start, end, join=0):
+    """
+    Find the missing slots of a series as minimal contiguous ranges
+    :param series: reading series
+    :param start: first expected slot epoch minute
+    :param end: last epoch minute that should be filled
+    :param join: ranges separated by at most this many present slots are merged into one request
+    :return: list of (first, last) missing slot epoch minutes, inclusive
+    """
+    if end < start:
+        return []
+    last_slot = start + (end - start) // SLOT_MINUTES * SLOT_MINUTES
+
+    gaps = []
+    expected = start
+    lo, hi = series.bounds(start, last_slot)
+    for minute in series.minutes[lo:hi]:
+        if minute > expected:
+            gaps.append((expected, minute - SLOT_MINUTES))
+        expected = max(expected, minute + SLOT_MINUTES)
+    if expected <= last_slot:
+        gaps.append((expected, last_slot))
+    return join_gaps(gaps, join)
+
+
+def join_gaps(gaps, join=0):
+    """
+    Merge gap ranges separated by only a few present slots
+    :param gaps: ascending list of (first, last) missing slot epoch minutes, inclusive
+    :param join: ranges separated by at most this many present slots are merged into one request
+    :return: list of (first, last) epoch minutes
+    """
+    # refetching a few present slots is cheaper than another request
+    merged = []
+    for first, last in gaps:
+        if merged and first - merged[-1][1] <= (join + 1) * SLOT_MINUTES:
+            merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def count_slots(gaps):
+    """
+    Count the slots covered by gap ranges
+    :param gaps: list of (first, last) epoch minutes
+    :return: number of slots
+    """
+    return sum((last - first) // SLOT_MINUTES + 1 for first, last in gaps)
+
+
+class GapIndex:
+    """
+    Missing slots of every stored series, with a slow retry schedule per range.
+    A new gap waits one retry interval before its first re-fetch, since late readings often arrive by themselves,
+    and every failed attempt doubles the wait up to the maximum interval.
+    """
+
+    def __init__(self, interval=GAP_RETRY_INTERVAL, max_interval=GAP_RETRY_MAX, join=GAP_JOIN_SLOTS):
+        """
+        Initialize the gap index
+        :param interval: seconds before the first re-fetch of a gap
+        :param max_interval: longest wait between re-fetches in seconds
+        :param join: present slots bridged when merging nearby gaps
+        :return: none
+        """
+        self.interval = interval
+        self.max_interval = max_interval
+        self.join = join
+
+        # per series key, gap range to [attempts, next retry]
+        self._gaps = {}
+        self._missing = {}
+
+    def update(self, key, gaps, now):
+        """
+        Rebuild the gaps of a series, keeping the schedule of the ranges still missing
+        :param key: series key
+        :param gaps: ascending list of missing slot ranges, as found by find_gaps
+        :param now: current date/time
+        :return: list of gap ranges
+        """
+        known = self._gaps.get(key, {})
+        self._missing[key] = count_slots(gaps)
+        gaps = join_gaps(gaps, self.join)
+        self._gaps[key] = {
+            gap: known.get(gap, [0, now + timedelta(seconds=self.interval)])
+            for gap in gaps
+        }
+        return gaps
+
+    def due(self, key, now, limit=None):
+        """
+        Return the gap ranges of a series due for a re-fetch, oldest first
+        :param key: series key
+        :param now: current date/time
+        :param limit: maximum number of ranges
+        :return: list of gap ranges
+        """
+        due = [gap for gap, (_, next_retry) in sorted(self._gaps.get(key, {}).items()) if next_retry <= now]
+        return due[:limit]
+
+    def attempted(self, key, gap, now):
+        """
+        Record a re-fetch of a gap range and plan its next one
+        :param key: series key
+        :param gap: gap range
+        :param now: current date/time
+        :return: none
+        """
+        state = self._gaps.get(key, {}).get(gap)
+        if state is None:
+            return
+        state[0] += 1
+        state[1] = now + timedelta(seconds=min(self.max_interval, self.interval * 2 ** state[0]))
+
+    def missing(self, key):
+        """
+        Return the number of missing slots of a series
+        :param key: series key
+        :return: number of slots
+        """
+        return self._missing.get(key, 0)
@@ -0,0 +1,131 @@
+"""
+Script file: metadata.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Persistent metadata cache for the n3rgy data integration
+"""
+
+import time
+import logging
+
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+    DEFAULT_METADATA_TTL
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class N3rgyMetadataCache:
+    """
+    Cache of the slowly changing n3rgy metadata (smart meter type, utility, reading type and element lists).
+    Entries are persisted in the Home Assistant storage and served even when stale,
+    a stale entry being refreshed lazily in the background.
+    """
+
+    def __init__(self, hass, api, ttl=DEFAULT_METADATA_TTL):
+        """
+        Initialize the metadata cache
+        :param hass: hass object
+        :param api: n3rgy async api client
+        :param ttl: seconds after which an entry is refreshed
+        :return: none
+        """
+        self.hass = hass
+        self.api = api
+        self.ttl = ttl
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.metadata.{api.mpxn}")
+        self._entries = None
+        self._refreshing = set()
+
+    async def async_load(self):
+        """
+        Load the persisted entries
+        :param: none
+        :return: none
+        """
+        if self._entries is None:
+            self._entries = await self._store.async_load() or {}
+
+    async def async_get(self, name, fetch, *args):
+        """
+        Return a cached metadata value, fetching it on a miss and refreshing it in the background once stale
+        :param name: metadata name
+        :param fetch: api coroutine function returning the value
+        :param args: api call arguments, part of the cache key
+        :return: metadata value
+        """
+        await self.async_load()
+        key = "/".join([name, *args])
+        entry = self._entries.get(key)
+        self.api.metrics.record_cache('metadata', entry is not None)
+
+        # miss
+        if entry is None:
+            _LOGGER.debug(f"[METADATA] Miss: {key}")
+            return await self._async_fetch(key, fetch, args)
+
+        # stale entries are served while a refresh runs
+        if time.time() - entry['fetched'] > self.ttl and key not in self._refreshing:
+            _LOGGER.debug(f"[METADATA] Refreshing: {key}")
+            self._refreshing.add(key)
+            self.hass.async_create_task(self._async_fetch(key, fetch, args))
+
+        return entry['value']
+
+    async def _async_fetch(self, key, fetch, args):
+        """
+        Fetch a metadata value and store it unless the request failed
+        :param key: cache key
+        :param fetch: api coroutine function returning the value
+        :param args: api call arguments
+        :return: metadata value
+        """
+        try:
+            value = await fetch(*args)
+        finally:
+            self._refreshing.discard(key)
+
+        if value is not None:
+            self._entries[key] = {'value': value, 'fetched': time.time()}
+            self._store.async_delay_save(lambda: self._entries, STORAGE_SAVE_DELAY)
+        return value
+
+    async def async_find_mxpn(self, mpxn):
+        """
+        Cached `find_mxpn`
+        :param mpxn: MPxN requested by the user
+        :return: smart meter type
+        """
+        return await self.async_get('find_mxpn', self.api.find_mxpn, mpxn)
+
+    async def async_get_utility_types(self):
+        """
+        Cached `get_utility_types`
+        :param: none
+        :return: list of available utility types
+        """
+        return await self.async_get('utility_types', self.api.get_utility_types)
+
+    async def async_get_reading_types(self, utility):
+        """
+        Cached `get_reading_types`
+        :param utility: utility associated with the request
+        :return: list of available reading types
+        """
+        return await self.async_get('reading_types', self.api.get_reading_types, utility)
+
+    async def async_get_supported_elements(self, utility, reading_type):
+        """
+        Cached `get_supported_elements`
+        :param utility: utility associated with the request
+        :param reading_type: reading type associated with the request
+        :return: list of available meter elements
+        """
+        return await self.async_get('supported_elements', self.api.get_supported_elements, utility, reading_type)
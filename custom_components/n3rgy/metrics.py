@@ -0,0 +1,282 @@
+"""
+Script file: metrics.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Performance metrics of the n3rgy data API client
+"""
+
+import time
+
+from bisect import bisect_left
+from collections import defaultdict
+
+from .const import LATENCY_BUCKETS, PARSE_BUCKETS
+
+
+class Histogram:
+    """Fixed bucket histogram of durations in seconds"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        """
+        Initialize the histogram
+        :param bounds: ascending bucket upper bounds, larger values go to an overflow bucket
+        :return: none
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """
+        Add a sample
+        :param value: duration in seconds
+        :return: none
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        """
+        Add the samples of another histogram with the same bounds
+        :param other: histogram
+        :return: none
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self):
+        """
+        Return the mean sample
+        :param: none
+        :return: mean in seconds, None without samples
+        """
+        return self.total / self.count if self.count else None
+
+    def percentile(self, q):
+        """
+        Return the upper bound of the bucket holding a percentile
+        :param q: percentile between 0 and 100
+        :return: duration in seconds, None without samples
+        """
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self):
+        """
+        Return the histogram as plain data
+        :param: none
+        :return: dict
+        """
+        buckets = {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets['le_inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'max': self.max,
+            'buckets': buckets
+        }
+
+
+class EndpointMetrics:
+    """Counters of one API endpoint"""
+
+    __slots__ = ('requests', 'errors', 'retries', 'coalesced', 'bytes', 'latency', 'parse')
+
+    def __init__(self):
+        """
+        Initialize the counters
+        :param: none
+        :return: none
+        """
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.bytes = 0
+        self.latency = Histogram()
+        self.parse = Histogram(PARSE_BUCKETS)
+
+    def as_dict(self):
+        """
+        Return the counters as plain data
+        :param: none
+        :return: dict
+        """
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'coalesced': self.coalesced,
+            'bytes': self.bytes,
+            'latency': self.latency.as_dict(),
+            'parse': self.parse.as_dict()
+        }
+
+
+class N3rgyMetrics:
+    """
+    Performance metrics of one n3rgy client and its coordinator.
+    Requests are grouped per endpoint (find-mpxn, discovery, utility/reading type series),
+    caches are counted per cache name and every coordinator refresh is timed.
+    """
+
+    def __init__(self):
+        """
+        Initialize the metrics
+        :param: none
+        :return: none
+        """
+        self.endpoints = defaultdict(EndpointMetrics)
+        self.cache_hits = defaultdict(int)
+        self.cache_misses = defaultdict(int)
+        self.refresh = Histogram()
+        self.last_refresh = None
+        self.last_refresh_at = None
+
+    @staticmethod
+    def endpoint_name(base_url, mpxn, url):
+        """
+        Name the endpoint of a request URL, leaving out the host and MPxN
+        :param base_url: API base URL
+        :param mpxn: MPxN of the client
+        :param url: request URL
+        :return: endpoint name such as 'electricity/consumption'
+        """
+        parts = url[len(base_url):].strip('/').split('/') if url.startswith(base_url) else url.split('/')
+        if parts and parts[0] == 'find-mpxn':
+            return 'find-mpxn'
+        if parts and parts[0] == mpxn:
+            parts = parts[1:3]
+        return '/'.join(parts) or 'utilities'
+
+    def record_request(self, endpoint, seconds, status, size=0, retry=False):
+        """
+        Record one request attempt
+        :param endpoint: endpoint name
+        :param seconds: time until the response was read
+        :param status: response status code, None on a transport error
+        :param size: response body size in bytes
+        :param retry: true if the attempt repeats a failed one
+        :return: none
+        """
+        metrics = self.endpoints[endpoint]
+        metrics.requests += 1
+        metrics.bytes += size
+        metrics.latency.observe(seconds)
+        if retry:
+            metrics.retries += 1
+        if status is None or status >= 400:
+            metrics.errors += 1
+
+    def record_coalesced(self, endpoint):
+        """
+        Record a request served by an identical one in flight or just finished
+        :param endpoint: endpoint name
+        :return: none
+        """
+        self.endpoints[endpoint].coalesced += 1
+
+    def record_parse(self, endpoint, seconds):
+        """
+        Record the time spent decoding a response
+        :param endpoint: endpoint name
+        :param seconds: decode time
+        :return: none
+        """
+        self.endpoints[endpoint].parse.observe(seconds)
+
+    def record_cache(self, name, hit):
+        """
+        Record a cache lookup
+        :param name: cache name
+        :param hit: true on a hit
+        :return: none
+        """
+        if hit:
+            self.cache_hits[name] += 1
+        else:
+            self.cache_misses[name] += 1
+
+    def record_refresh(self, seconds):
+        """
+        Record the duration of a coordinator refresh
+        :param seconds: refresh duration
+        :return: none
+        """
+        self.refresh.observe(seconds)
+        self.last_refresh = seconds
+        self.last_refresh_at = time.time()
+
+    def cache_hit_ratio(self, name=None):
+        """
+        Return the share of cache lookups served from cache
+        :param name: cache name, all caches when omitted
+        :return: ratio between 0 and 1, None without lookups
+        """
+        if name is None:
+            hits = sum(self.cache_hits.values())
+            misses = sum(self.cache_misses.values())
+        else:
+            hits = self.cache_hits[name]
+            misses = self.cache_misses[name]
+        return hits / (hits + misses) if hits + misses else None
+
+    def summary(self):
+        """
+        Return the headline figures shown by the diagnostic sensors
+        :param: none
+        :return: dict
+        """
+        latency = Histogram()
+        for metrics in self.endpoints.values():
+            latency.merge(metrics.latency)
+
+        p95 = latency.percentile(95)
+        ratio = self.cache_hit_ratio()
+        return {
+            'requests': sum(m.requests for m in self.endpoints.values()),
+            'errors': sum(m.errors for m in self.endpoints.values()),
+            'retries': sum(m.retries for m in self.endpoints.values()),
+            'coalesced': sum(m.coalesced for m in self.endpoints.values()),
+            'bytes': sum(m.bytes for m in self.endpoints.values()),
+            'latency_p95': round(p95 * 1000) if p95 is not None else None,
+            'cache_hit_ratio': round(ratio * 100, 1) if ratio is not None else None,
+            'refresh_duration': round(self.last_refresh * 1000) if self.last_refresh is not None else None
+        }
+
+    def as_dict(self):
+        """
+        Return every metric as plain data
+        :param: none
+        :return: dict
+        """
+        return {
+            'summary': self.summary(),
+            'endpoints': {name: metrics.as_dict() for name, metrics in self.endpoints.items()},
+            'cache': {
+                name: {'hits': self.cache_hits[name], 'misses': self.cache_misses[name]}
+                for name in set(self.cache_hits) | set(self.cache_misses)
+            },
+            'refresh': self.refresh.as_dict(),
+            'last_refresh_at': self.last_refresh_at
+        }
@@ -1,19 +1,48 @@
 """
 Script file: n3rgy_api.py
 Created on: Jan Feb 4, 2021
-Last modified on: Feb 20, 2021
+Last modified on: Oct 17, 2026
 
 Comments:
     n3rgy data api functions
 """
 
 import re
-import json
+import time
+import itertools
+from datetime import datetime, timedelta
 import logging
 import base64
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from requests.structures import CaseInsensitiveDict
 
+from .const import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_KEEPALIVE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_CHUNK_DAYS,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RESULT_TTL,
+    SLOT_MINUTES,
+    INPUT_DATETIME_FORMAT,
+    READING_DATETIME_FORMAT,
+    STREAM_CHUNK_SIZE
+)
+from .series import ReadingSeries, from_epoch_minute
+from .throttle import RequestScheduler, CircuitOpenError
+from .metrics import N3rgyMetrics
+from .decoder import (
+    SCHEMA_SERIES,
+    SCHEMA_ENTRIES,
+    SCHEMA_DEVICE,
+    SeriesStreamDecoder,
+    decode,
+    loads
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -26,62 +55,206 @@ class StatusCode:
     ST_NOT_FOUND = 404
 
 
+# transport errors the request scheduler retries
+SYNC_ERRORS = (requests.RequestException,)
+ASYNC_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def build_headers(api_key):
+    """
+    Build the request headers shared by every call of a client.
+    :param api_key: n3rgy data access key (API key)
+    :return: request headers
+    """
+    headers = CaseInsensitiveDict()
+    headers["Authorization"] = api_key
+    return headers
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE):
+    """
+    Create a keep-alive requests session backed by a bounded connection pool.
+    :param pool_size: maximum number of pooled connections per host
+    :return: requests session
+    """
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def create_async_session(pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE, timeout=DEFAULT_TIMEOUT):
+    """
+    Create a keep-alive aiohttp client session backed by a bounded connection pool.
+    Must be called from within the event loop.
+    :param pool_size: maximum number of pooled connections
+    :param keepalive: seconds an idle connection is kept open
+    :param timeout: request timeout in seconds
+    :return: aiohttp client session
+    """
+    connector = aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=keepalive)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout))
+
+
+def plan_ranges(start, end, chunk_days=DEFAULT_CHUNK_DAYS):
+    """
+    Split a start/end window into consecutive chunks the API accepts.
+    :param start: start date/time of the period, in the format YYYYMMDDHHmm
+    :param end: end date/time of the period, in the format YYYYMMDDHHmm
+    :param chunk_days: maximum length of a chunk in days
+    :return: list of (start, end) pairs in the format YYYYMMDDHHmm
+    """
+    dt_start = datetime.strptime(start, INPUT_DATETIME_FORMAT)
+    dt_end = datetime.strptime(end, INPUT_DATETIME_FORMAT)
+    step = timedelta(days=chunk_days)
+
+    ranges = []
+    while dt_start <= dt_end:
+        dt_chunk_end = min(dt_start + step - timedelta(minutes=1), dt_end)
+        ranges.append((
+            datetime.strftime(dt_start, INPUT_DATETIME_FORMAT),
+            datetime.strftime(dt_chunk_end, INPUT_DATETIME_FORMAT)
+        ))
+        dt_start = dt_chunk_end + timedelta(minutes=1)
+
+    return ranges
+
+
+def next_partial_start(data, end):
+    """
+    Work out where to resume after a partial (206) response.
+    :param data: partial response data
+    :param end: end date/time of the requested chunk, in the format YYYYMMDDHHmm
+    :return: start of the follow-up request in the format YYYYMMDDHHmm, or None when nothing is left
+    """
+    try:
+        if isinstance(data.get('series'), ReadingSeries):
+            dt_last = from_epoch_minute(data['series'].last_minute)
+        else:
+            dt_last = datetime.strptime(max(v['timestamp'] for v in data['values']), READING_DATETIME_FORMAT)
+        dt_next = dt_last + timedelta(minutes=SLOT_MINUTES)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+    if dt_next > datetime.strptime(end, INPUT_DATETIME_FORMAT):
+        return None
+    return datetime.strftime(dt_next, INPUT_DATETIME_FORMAT)
+
+
+def follow_up_start(status, data, start, end, tag=None):
+    """
+    Work out whether a chunk needs another request after a response.
+    Partial responses are followed for as long as they move forward, so small pages still cover the whole chunk.
+    :param status: response status code
+    :param data: response data
+    :param start: start date/time of the answered request, in the format YYYYMMDDHHmm
+    :param end: end date/time of the requested chunk, in the format YYYYMMDDHHmm
+    :param tag: tag for debug
+    :return: start of the follow-up request in the format YYYYMMDDHHmm, or None when the chunk is complete
+    """
+    if status != StatusCode.ST_PARTIAL_CONTENT:
+        return None
+
+    next_start = next_partial_start(data, end)
+    if next_start is not None and next_start <= start:
+        _LOGGER.warning(f"[{tag}] Partial response did not move past {start}, readings up to {end} dropped")
+        return None
+    return next_start
+
+
+def stitch_responses(responses, start, end):
+    """
+    Stitch chunked responses back into one ordered, de-duplicated series.
+    :param responses: list of response data
+    :param start: start date/time of the whole period, in the format YYYYMMDDHHmm
+    :param end: end date/time of the whole period, in the format YYYYMMDDHHmm
+    :return: response data covering the whole period, None if no chunk succeeded
+    """
+    data = None
+    values = {}
+    series = ReadingSeries()
+    for response in responses:
+        if not isinstance(response, dict):
+            continue
+        if data is None:
+            data = dict(response)
+        if isinstance(response.get('series'), ReadingSeries):
+            series = series.merge(response['series'])
+        for value in response.get('values') or []:
+            values[value.get('timestamp')] = value
+
+    if data is None:
+        return None
+
+    data['start'] = start
+    data['end'] = end
+
+    # streamed responses are stitched as reading series
+    if 'series' in data:
+        data['series'] = series.merge(ReadingSeries.from_values(values.values()))
+        data.pop('values', None)
+    else:
+        data['values'] = [values[t] for t in sorted(values, key=lambda t: t or '')]
+    return data
+
+
 class N3rgyGrantConsent:
     """Integration with Grant Consent"""
 
-    def __init__(self, mpxn, api_key):
+    def __init__(self, mpxn, api_key, session=None, timeout=DEFAULT_TIMEOUT, scheduler=None):
         """
         Initialize Grant Consent client.
         :param mpxn: the MPxN property id getting from the customer (consumer)
         :param api_key: n3rgy data access key (API key)
+        :param session: shared requests session, a private one is created if omitted
+        :param timeout: request timeout in seconds
+        :param scheduler: shared request scheduler, a private one is created if omitted
         """
         self.mpxn = mpxn
         self.api_key = api_key
+        self.headers = build_headers(api_key)
+        self.timeout = timeout
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self._owns_session = session is None
+        self.session = session if session is not None else create_session()
 
-    def get_operation_authorization_token(self, base_url):
+    def close(self):
         """
-        Request of an operation authorization token.
-        :param base_url: base URL to get token
-        :return: session id or None
+        Release the pooled connections if the session is owned by this client.
+        :param: none
+        :return: none
         """
-        # api request url
-        url = f'{base_url}/consents/sessions'
-        
-        # api request headers
-        headers = CaseInsensitiveDict()
-        headers["Authorization"] = self.api_key
-
-        # api request body
-        data = {
-            "mpxn": self.mpxn,
-            "apiKey": self.api_key
-        }
+        if self._owns_session:
+            self.session.close()
 
-        # call n3rgy api
-        res = None
-        response = requests.post(url, headers=headers, json=data)
+    @staticmethod
+    def send(response):
+        """
+        Shape a response for the request scheduler.
+        :param response: requests response
+        :return: (status code, headers, response)
+        """
+        return (response.status_code, response.headers, response)
 
-        # fetch data from response object
-        if response.status_code == StatusCode.ST_CREATED:
-            res = response.json()
-            res = res['sessionId']
-            _LOGGER.debug(f"[GET_TOKEN] Session ID: {res}")
-        else:
-            # bad request
-            _LOGGER.warning(f"[GET_TOKEN] Bad request: {response.status_code}")
-        
-        return res
+    def session_request(self, base_url):
+        """
+        Build the request of an operation authorization token.
+        :param base_url: base URL to get token
+        :return: (request url, request body)
+        """
+        return (f'{base_url}/consents/sessions', {"mpxn": self.mpxn, "apiKey": self.api_key})
 
-    def invocation_endpoint_url(self, base_url, session_id, consent_type, return_url, error_url):
+    def handover_url(self, base_url, session_id, consent_type, return_url, error_url):
         """
-        Redirect the consumer to n3rgy data Grant Consent endpoint.
+        Build the Grant Consent handover URL.
         The parameters must be encoded in Base64 and then URL Encoded.
         :param base_url: base URL to handover
         :param session_id: session id generated for a new grant consent process
         :param consent_type: consent type {cin, ihdmac_full, ihdmac_4}
         :param return_url: callback endpoint in a successful grant consent operation
         :param error_url: callback endpoint in an unsuccessful grant consent operation
-        :return: True if successful, False otherwise
+        :return: handover URL
         """
         # encode query
         query = f"sessionId={session_id}&mpxn={self.mpxn}&consentType={consent_type}&returnUrl={return_url}&errorUrl={error_url}"
@@ -91,22 +264,169 @@ class N3rgyGrantConsent:
         # api request url
         url = f'{base_url}/consent/{encoded_query}'
         _LOGGER.debug(f"Consent URL: {url}")
-        
-        # api request headers
-        headers = CaseInsensitiveDict()
-        headers["Authorization"] = self.api_key
+        return url
 
-        # call n3rgy api
-        response = requests.get(url, headers=headers)
-        if response.status_code == StatusCode.ST_OK:
+    @staticmethod
+    def parse_session_id(status, body):
+        """
+        Parse the session id out of an operation authorization token response.
+        :param status: response status code
+        :param body: response body
+        :return: session id or None
+        """
+        if status != StatusCode.ST_CREATED:
+            # bad request
+            _LOGGER.warning(f"[GET_TOKEN] Bad request: {status}")
+            return None
+
+        try:
+            res = loads(body)['sessionId']
+        except (ValueError, TypeError, KeyError) as err:
+            _LOGGER.warning(f"[GET_TOKEN] Invalid response: {str(err)}")
+            return None
+        _LOGGER.debug(f"[GET_TOKEN] Session ID: {res}")
+        return res
+
+    @staticmethod
+    def parse_handover(status):
+        """
+        Check the outcome of a Grant Consent handover.
+        :param status: response status code
+        :return: True if successful, False otherwise
+        """
+        if status == StatusCode.ST_OK:
             # successful grant consent
             _LOGGER.debug("[HANDOVER] Successful")
             return True
-        else:
-            # grant consent failed
-            _LOGGER.warning(f"[HANDOVER] Grant consent failed: {response.status_code}")
+
+        # grant consent failed
+        _LOGGER.warning(f"[HANDOVER] Grant consent failed: {status}")
+        return False
+
+    def get_operation_authorization_token(self, base_url):
+        """
+        Request of an operation authorization token.
+        :param base_url: base URL to get token
+        :return: session id or None
+        """
+        url, data = self.session_request(base_url)
+
+        # call n3rgy api, a consent session is not safe to repeat
+        try:
+            response = self.scheduler.execute(
+                lambda: self.send(self.session.post(url, headers=self.headers, json=data, timeout=self.timeout)),
+                errors=SYNC_ERRORS, safe=False
+            )[2]
+        except (CircuitOpenError, *SYNC_ERRORS) as err:
+            _LOGGER.warning(f"[GET_TOKEN] Request failed: {str(err)}")
+            return None
+
+        # fetch data from response object
+        return self.parse_session_id(response.status_code, response.content)
+
+    def invocation_endpoint_url(self, base_url, session_id, consent_type, return_url, error_url):
+        """
+        Redirect the consumer to n3rgy data Grant Consent endpoint.
+        The parameters must be encoded in Base64 and then URL Encoded.
+        :param base_url: base URL to handover
+        :param session_id: session id generated for a new grant consent process
+        :param consent_type: consent type {cin, ihdmac_full, ihdmac_4}
+        :param return_url: callback endpoint in a successful grant consent operation
+        :param error_url: callback endpoint in an unsuccessful grant consent operation
+        :return: True if successful, False otherwise
+        """
+        url = self.handover_url(base_url, session_id, consent_type, return_url, error_url)
+
+        # call n3rgy api
+        try:
+            response = self.scheduler.execute(
+                lambda: self.send(self.session.get(url, headers=self.headers, timeout=self.timeout)),
+                errors=SYNC_ERRORS
+            )[2]
+        except (CircuitOpenError, *SYNC_ERRORS) as err:
+            _LOGGER.warning(f"[HANDOVER] Request failed: {str(err)}")
             return False
 
+        return self.parse_handover(response.status_code)
+
+
+class N3rgyAsyncGrantConsent(N3rgyGrantConsent):
+    """
+    Asyncio variant of the Grant Consent client.
+    Requests run on the event loop through an aiohttp client session instead of blocking a thread.
+    """
+
+    def __init__(self, mpxn, api_key, session=None, timeout=DEFAULT_TIMEOUT, scheduler=None):
+        """
+        Initialize asyncio Grant Consent client.
+        Must be created from within the event loop.
+        :param mpxn: the MPxN property id getting from the customer (consumer)
+        :param api_key: n3rgy data access key (API key)
+        :param session: shared aiohttp client session, a private one is created if omitted
+        :param timeout: request timeout in seconds
+        :param scheduler: shared request scheduler, a private one is created if omitted
+        """
+        self.client_timeout = aiohttp.ClientTimeout(total=timeout)
+        super().__init__(mpxn, api_key, session=session if session is not None else create_async_session(timeout=timeout),
+                         timeout=timeout, scheduler=scheduler)
+        self._owns_session = session is None
+
+    async def close(self):
+        """
+        Close the connection pool if it is owned by this client.
+        :param: none
+        :return: none
+        """
+        if self._owns_session and not self.session.closed:
+            await self.session.close()
+
+    async def get_operation_authorization_token(self, base_url):
+        """
+        Request of an operation authorization token.
+        :param base_url: base URL to get token
+        :return: session id or None
+        """
+        url, data = self.session_request(base_url)
+
+        async def send():
+            async with self.session.post(url, headers=self.headers, json=data, timeout=self.client_timeout) as response:
+                return (response.status, response.headers, await response.read())
+
+        # call n3rgy api, a consent session is not safe to repeat
+        try:
+            status, _, body = await self.scheduler.async_execute(send, errors=ASYNC_ERRORS, safe=False)
+        except (CircuitOpenError, *ASYNC_ERRORS) as err:
+            _LOGGER.warning(f"[GET_TOKEN] Request failed: {str(err)}")
+            return None
+
+        return self.parse_session_id(status, body)
+
+    async def invocation_endpoint_url(self, base_url, session_id, consent_type, return_url, error_url):
+        """
+        Redirect the consumer to n3rgy data Grant Consent endpoint.
+        :param base_url: base URL to handover
+        :param session_id: session id generated for a new grant consent process
+        :param consent_type: consent type {cin, ihdmac_full, ihdmac_4}
+        :param return_url: callback endpoint in a successful grant consent operation
+        :param error_url: callback endpoint in an unsuccessful grant consent operation
+        :return: True if successful, False otherwise
+        """
+        url = self.handover_url(base_url, session_id, consent_type, return_url, error_url)
+
+        async def send():
+            async with self.session.get(url, headers=self.headers, timeout=self.client_timeout) as response:
+                await response.read()
+                return (response.status, response.headers, None)
+
+        # call n3rgy api
+        try:
+            status = (await self.scheduler.async_execute(send, errors=ASYNC_ERRORS))[0]
+        except (CircuitOpenError, *ASYNC_ERRORS) as err:
+            _LOGGER.warning(f"[HANDOVER] Request failed: {str(err)}")
+            return False
+
+        return self.parse_handover(status)
+
 
 class N3rgyDataApi:
     """
@@ -115,13 +435,19 @@ class N3rgyDataApi:
     processed into an easy to consume format.
     """
 
-    def __init__(self, host, api_key, property_id):
+    def __init__(self, host, api_key, property_id, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                 chunk_days=DEFAULT_CHUNK_DAYS, concurrency=DEFAULT_CONCURRENCY, scheduler=None, metrics=None):
         """
         Initialize n3rgy data api client.
         :param host: host URL
         :param api_key: API key (MPxN)
         :param property_id: authorized property id
-
+        :param pool_size: maximum number of pooled keep-alive connections
+        :param timeout: request timeout in seconds
+        :param chunk_days: maximum length in days of a single ranged request
+        :param concurrency: maximum number of chunks fetched at once
+        :param scheduler: shared request scheduler, a private one is created if omitted
+        :param metrics: performance metrics, a private instance is created if omitted
         """
         # base url validation
         if host is None:
@@ -138,6 +464,85 @@ class N3rgyDataApi:
         self.base_url = host
         self.api_key = api_key
         self.mpxn = property_id
+        self.headers = build_headers(api_key)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.chunk_days = chunk_days
+        self.concurrency = concurrency
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self.metrics = metrics if metrics is not None else N3rgyMetrics()
+        self.session = self.create_session()
+
+        # set when the api refuses access to the meter data
+        self.consent_lapsed = False
+
+    def create_session(self):
+        """
+        Create the connection pool used by this client for its whole lifetime.
+        :param: none
+        :return: requests session
+        """
+        return create_session(self.pool_size)
+
+    def close(self):
+        """
+        Close the connection pool.
+        :param: none
+        :return: none
+        """
+        self.session.close()
+
+    def get(self, url, payload=None):
+        """
+        Send a GET request through the request scheduler.
+        :param url: request URL
+        :param payload: payload data for GET request
+        :return: (status code, response body), (None, None) if the request could not be completed
+        """
+        endpoint = self.endpoint_name(url)
+        attempts = itertools.count()
+
+        def send():
+            retry = next(attempts) > 0
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, params=payload, headers=self.headers, timeout=self.timeout)
+            except SYNC_ERRORS:
+                self.metrics.record_request(endpoint, time.monotonic() - started, None, retry=retry)
+                raise
+            self.metrics.record_request(
+                endpoint, time.monotonic() - started, response.status_code, len(response.content), retry=retry
+            )
+            return (response.status_code, response.headers, response.content)
+
+        try:
+            status, _, body = self.scheduler.execute(send, errors=SYNC_ERRORS)
+        except (CircuitOpenError, *SYNC_ERRORS) as err:
+            _LOGGER.warning(f"[REQUEST] Request failed: {str(err)}")
+            return (None, None)
+        return (status, body)
+
+    def endpoint_name(self, url):
+        """
+        Name the endpoint of a request URL for the metrics.
+        :param url: request URL
+        :return: endpoint name
+        """
+        return self.metrics.endpoint_name(self.base_url, self.mpxn, url)
+
+    def decode(self, url, body, schema, tag):
+        """
+        Decode a response body, timing the decode.
+        :param url: request URL
+        :param body: response body
+        :param schema: expected response layout
+        :param tag: tag for debug
+        :return: response data or None
+        """
+        started = time.monotonic()
+        data = decode(body, schema, tag)
+        self.metrics.record_parse(self.endpoint_name(url), time.monotonic() - started)
+        return data
 
     def find_mxpn(self, mpxn):
         """
@@ -153,44 +558,42 @@ class N3rgyDataApi:
         # api request url
         url = f'{self.base_url}/find-mpxn/{mpxn}'
 
-        # api request headers
-        headers = CaseInsensitiveDict()
-        headers["Authorization"] = self.api_key
-
         # call n3rgy api
-        data = None
-        response = requests.get(url, headers=headers)
+        return self.parse_device_type(*self.get(url))
 
-        # fetch data from response object
-        if response.status_code == StatusCode.ST_OK:
-            try:
-                data = json.loads(response.text)
-            except ValueError:
-                data = response.text
+    @staticmethod
+    def parse_device_type(status, body):
+        """
+        Read the smart meter type from a find-mpxn response.
+        :param status: response status code
+        :param body: response body
+        :return: smart meter type or None
+        """
+        data = None
+        if status == StatusCode.ST_OK:
+            data = decode(body, SCHEMA_DEVICE, 'GET_TYPE')
 
             # logging response data
-            data = data['deviceType']
-            _LOGGER.debug(f"[GET_TYPE] Device type: {data}")
-        elif response.status_code == StatusCode.ST_NOT_FOUND:
+            if data is not None:
+                data = data['deviceType']
+                _LOGGER.debug(f"[GET_TYPE] Device type: {data}")
+        elif status == StatusCode.ST_NOT_FOUND:
             # MPxN not found
-            _LOGGER.debug(f"[GET_TYPE] MPxN not found: {response.status_code}")
-        else:
+            _LOGGER.debug(f"[GET_TYPE] MPxN not found: {status}")
+        elif status is not None:
             # forbidden error
-            _LOGGER.warning(f"[GET_TYPE] Invalid API request: {response.status_code}")
+            _LOGGER.warning(f"[GET_TYPE] Invalid API request: {status}")
 
         return data
 
-    def call_api(self, utility=None, reading_type=None, element=None, payload=None, tag=None):
+    def build_url(self, utility=None, reading_type=None, element=None):
         """
-        n3rgy data API call base function.
+        Build the resource URL for the given meter triplet.
         :param utility: utility associated with the request {'electricity', 'gas', ...}
         :param reading_type: reading type {'consumption', 'production', 'tariff')}
-        :param element: element for which prices are returned, only applies to electric meters, ignored otherwise
-        :param payload: payload data for GET request
-        :param tag: tag for debug
-        :return: response of API request
+        :param element: meter element, only applies to electric meters
+        :return: request URL
         """
-        # api request url
         url = f'{self.base_url}/{self.mpxn}'
 
         # utility is not empty
@@ -205,30 +608,95 @@ class N3rgyDataApi:
                 if element is not None:
                     url = f'{url}/{element}'
 
-        # api request headers
-        headers = CaseInsensitiveDict()
-        headers["Authorization"] = self.api_key
+        return url
 
+    def call_api(self, utility=None, reading_type=None, element=None, payload=None, tag=None, schema=None):
+        """
+        n3rgy data API call base function.
+        :param utility: utility associated with the request {'electricity', 'gas', ...}
+        :param reading_type: reading type {'consumption', 'production', 'tariff')}
+        :param element: element for which prices are returned, only applies to electric meters, ignored otherwise
+        :param payload: payload data for GET request
+        :param tag: tag for debug
+        :param schema: expected response layout
+        :return: response of API request
+        """
+        # api request url
+        url = self.build_url(utility, reading_type, element)
+        return self.request(url, payload=payload, tag=tag, schema=schema)[1]
+
+    def request(self, url, payload=None, tag=None, schema=None):
+        """
+        Send a GET request to the n3rgy data API.
+        :param url: request URL
+        :param payload: payload data for GET request
+        :param tag: tag for debug
+        :param schema: expected response layout
+        :return: (status code, response data)
+        """
         # call n3rgy api
         data = None
-        response = requests.get(url, params=payload, headers=headers)
+        status, body = self.get(url, payload)
 
         # fetch data from response object
-        if response.status_code in [StatusCode.ST_OK, StatusCode.ST_PARTIAL_CONTENT]:
-            try:
-                data = json.loads(response.text)
-            except ValueError:
-                data = response.text
+        if status in [StatusCode.ST_OK, StatusCode.ST_PARTIAL_CONTENT]:
+            data = self.decode(url, body, schema, tag)
 
             # logging response data
             if tag is not None:
                 _LOGGER.debug(f"[{tag}] Response: {data}")
-        else:
+        elif status is not None:
             # logging error
             if tag is not None:
-                _LOGGER.warning(f"[{tag}] Invalid API request: {response.status_code}")
+                _LOGGER.warning(f"[{tag}] Invalid API request: {status}")
 
-        return data
+            # access to the meter data was withdrawn or has expired
+            if status == StatusCode.ST_FORBIDDEN:
+                self.consent_lapsed = True
+
+        return (status, data)
+
+    def fetch_range(self, url, payload, tag=None):
+        """
+        Fetch one chunk of a ranged series, following up on partial (206) responses.
+        :param url: request URL
+        :param payload: payload data including the chunk start/end
+        :param tag: tag for debug
+        :return: response data for the chunk
+        """
+        status, data = self.request(url, payload=payload, tag=tag, schema=SCHEMA_SERIES)
+        responses = [data]
+
+        start = follow_up_start(status, data, payload['start'], payload['end'], tag)
+        while start is not None:
+            status, data = self.request(url, payload={**payload, 'start': start}, tag=tag, schema=SCHEMA_SERIES)
+            responses.append(data)
+            start = follow_up_start(status, data, start, payload['end'], tag)
+
+        return stitch_responses(responses, payload['start'], payload['end'])
+
+    def read_series(self, utility, reading_type, start, end, payload=None, tag=None):
+        """
+        Read a ranged series, splitting long windows into chunks and stitching the results together.
+        :param utility: utility associated with the request
+        :param reading_type: reading type associated with the request
+        :param start: start date/time of the period, in the format YYYYMMDDHHmm
+        :param end: end date/time of the period, in the format YYYYMMDDHHmm
+        :param payload: extra query params
+        :param tag: tag for debug
+        :return: series data list
+        """
+        url = self.build_url(utility, reading_type, '1')
+        dates = self.get_valid_date(start, end)
+        if dates is None:
+            return self.request(url, payload=payload, tag=tag, schema=SCHEMA_SERIES)[1]
+
+        ranges = plan_ranges(start, end, self.chunk_days)
+        responses = [
+            self.fetch_range(url, {**(payload or {}), 'start': s, 'end': e}, tag=tag)
+            for s, e in ranges
+        ]
+        return stitch_responses(responses, start, end)
 
     def get_valid_date(self, start, end):
         """
@@ -269,10 +737,7 @@ class N3rgyDataApi:
         :param granularity: granularity of the consumption data
         :return: consumption data list
         """
-        payload = self.get_valid_date(start, end)
-        if payload is not None:
-            payload['granularity'] = granularity
-        return self.call_api(utility, 'consumption', '1', payload=payload)
+        return self.read_series(utility, 'consumption', start, end, payload={'granularity': granularity})
 
     def read_tariff(self, utility, start, end):
         """
@@ -286,7 +751,7 @@ class N3rgyDataApi:
         :return: tariff data list
         """
         payload = self.get_valid_date(start, end)
-        return self.call_api(utility, 'tariff', '1', payload=payload, tag='READ_TARIFF')
+        return self.call_api(utility, 'tariff', '1', payload=payload, tag='READ_TARIFF', schema=SCHEMA_SERIES)
 
     def read_export(self, utility, start, end):
         """
@@ -297,8 +762,7 @@ class N3rgyDataApi:
         :param start: start date/time of the period, in the format YYYYMMDDHHmm
         :param end: end date/time of the period, in the format YYYYMMDDHHmm
         """
-        payload = self.get_valid_date(start, end)
-        return self.call_api(utility, 'production', '1', payload=payload, tag='READ_EXPORT')
+        return self.read_series(utility, 'production', start, end, tag='READ_EXPORT')
 
     def get_supported_elements(self, utility, reading_type):
         """
@@ -308,7 +772,7 @@ class N3rgyDataApi:
         :param reading_type: reading type associated with the request
         :return: list of available meter elements
         """
-        return self.call_api(utility, reading_type)
+        return self.call_api(utility, reading_type, schema=SCHEMA_ENTRIES)
 
     def get_reading_types(self, utility):
         """
@@ -318,7 +782,7 @@ class N3rgyDataApi:
         :param utility: utility associated with the request
         :return: list of available reading types
         """
-        return self.call_api(utility, tag='GET_READING_TYPES')
+        return self.call_api(utility, tag='GET_READING_TYPES', schema=SCHEMA_ENTRIES)
 
     def get_utility_types(self):
         """
@@ -328,4 +792,277 @@ class N3rgyDataApi:
         :param: none
         :return: list of available utility types
         """
-        return self.call_api(tag='GET_UTILITY')
+        return self.call_api(tag='GET_UTILITY', schema=SCHEMA_ENTRIES)
+
+
+class N3rgyAsyncDataApi(N3rgyDataApi):
+    """
+    Asyncio variant of the n3rgy data api client.
+    Requests run on the event loop through an aiohttp client session instead of an executor thread.
+    The read methods inherited from N3rgyDataApi return awaitables on this client.
+    Identical requests (same URL and query params) issued while one is in flight share its response.
+    """
+
+    def __init__(self, host, api_key, property_id, session=None, pool_size=DEFAULT_POOL_SIZE,
+                 keepalive=DEFAULT_KEEPALIVE, timeout=DEFAULT_TIMEOUT, chunk_days=DEFAULT_CHUNK_DAYS,
+                 concurrency=DEFAULT_CONCURRENCY, scheduler=None, metrics=None, result_ttl=DEFAULT_RESULT_TTL):
+        """
+        Initialize asyncio n3rgy data api client.
+        Must be created from within the event loop.
+        :param host: host URL
+        :param api_key: API key (MPxN)
+        :param property_id: authorized property id
+        :param session: shared aiohttp client session, a private pooled one is created if omitted
+        :param pool_size: maximum number of pooled keep-alive connections
+        :param keepalive: seconds an idle connection is kept open
+        :param timeout: request timeout in seconds
+        :param chunk_days: maximum length in days of a single ranged request
+        :param concurrency: maximum number of chunks fetched at once
+        :param scheduler: shared request scheduler, a private one is created if omitted
+        :param metrics: performance metrics, a private instance is created if omitted
+        :param result_ttl: seconds a successful response is served again to identical requests
+        """
+        self.keepalive = keepalive
+        self.client_timeout = aiohttp.ClientTimeout(total=timeout)
+        self._shared_session = session
+
+        # coalesced requests, keyed by (url, query params, stream)
+        self.result_ttl = result_ttl
+        self._inflight = {}
+        self._results = {}
+        super().__init__(host, api_key, property_id, pool_size=pool_size, timeout=timeout,
+                         chunk_days=chunk_days, concurrency=concurrency, scheduler=scheduler,
+                         metrics=metrics)
+
+    def create_session(self):
+        """
+        Create the aiohttp connection pool used by this client for its whole lifetime.
+        :param: none
+        :return: aiohttp client session
+        """
+        if self._shared_session is not None:
+            return self._shared_session
+
+        return create_async_session(self.pool_size, self.keepalive, self.client_timeout.total)
+
+    async def close(self):
+        """
+        Close the connection pool if it is owned by this client.
+        :param: none
+        :return: none
+        """
+        if self._shared_session is None and not self.session.closed:
+            await self.session.close()
+
+    async def get(self, url, payload=None, stream=False):
+        """
+        Send a GET request through the request scheduler.
+        :param url: request URL
+        :param payload: payload data for GET request
+        :param stream: decode a successful series response incrementally
+        :return: (status code, response body or streamed data), (None, None) if the request could not be completed
+        """
+        endpoint = self.endpoint_name(url)
+        attempts = itertools.count()
+
+        async def send():
+            retry = next(attempts) > 0
+            started = time.monotonic()
+            try:
+                async with self.session.get(url, params=payload, headers=self.headers, timeout=self.client_timeout) as response:
+                    if stream and response.status in [StatusCode.ST_OK, StatusCode.ST_PARTIAL_CONTENT]:
+                        # decode time of a streamed body is the time spent in the decoder
+                        size = 0
+                        parse = 0.0
+                        decoder = SeriesStreamDecoder()
+                        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                            size += len(chunk)
+                            fed = time.monotonic()
+                            decoder.feed(chunk)
+                            parse += time.monotonic() - fed
+                        fed = time.monotonic()
+                        result = decoder.close()
+                        self.metrics.record_parse(endpoint, parse + time.monotonic() - fed)
+                    else:
+                        result = await response.read()
+                        size = len(result)
+            except ASYNC_ERRORS:
+                self.metrics.record_request(endpoint, time.monotonic() - started, None, retry=retry)
+                raise
+            self.metrics.record_request(endpoint, time.monotonic() - started, response.status, size, retry=retry)
+            return (response.status, response.headers, result)
+
+        try:
+            status, _, body = await self.scheduler.async_execute(send, errors=ASYNC_ERRORS)
+        except (CircuitOpenError, *ASYNC_ERRORS) as err:
+            _LOGGER.warning(f"[REQUEST] Request failed: {str(err)}")
+            return (None, None)
+        return (status, body)
+
+    async def find_mxpn(self, mpxn):
+        """
+        Searches the n3rgy database for the given MPxN.
+        :param mpxn: MPxN requested by the user
+        :return: smart meter type
+        """
+        # validate MPxN
+        if not re.search(r'[0-9]{13}||[0-9]{9}', mpxn):
+            raise ValueError("Invalid MPxN")
+
+        # api request url
+        url = f'{self.base_url}/find-mpxn/{mpxn}'
+
+        # call n3rgy api
+        return self.parse_device_type(*(await self.get(url)))
+
+    async def call_api(self, utility=None, reading_type=None, element=None, payload=None, tag=None, schema=None):
+        """
+        n3rgy data API call base function.
+        :param utility: utility associated with the request {'electricity', 'gas', ...}
+        :param reading_type: reading type {'consumption', 'production', 'tariff')}
+        :param element: element for which prices are returned, only applies to electric meters, ignored otherwise
+        :param payload: payload data for GET request
+        :param tag: tag for debug
+        :param schema: expected response layout
+        :return: response of API request
+        """
+        # api request url
+        url = self.build_url(utility, reading_type, element)
+        return (await self.request(url, payload=payload, tag=tag, schema=schema))[1]
+
+    async def request(self, url, payload=None, tag=None, schema=None, stream=False):
+        """
+        Send a GET request to the n3rgy data API, coalescing identical requests.
+        Callers of a request already in flight wait for it instead of sending their own,
+        and a successful response is served again until the result ttl runs out.
+        The response data is shared between the callers and must not be modified.
+        :param url: request URL
+        :param payload: payload data for GET request
+        :param tag: tag for debug
+        :param schema: expected response layout
+        :param stream: decode a series response incrementally into a reading series instead of a `values` list
+        :return: (status code, response data)
+        """
+        key = (url, tuple(sorted((payload or {}).items())), stream)
+
+        # recently finished
+        cached = self._results.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self.metrics.record_coalesced(self.endpoint_name(url))
+                return cached[1]
+            del self._results[key]
+
+        # in flight, the request runs in its own task so a cancelled caller does not cancel it for the others
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request(url, payload, tag, schema, stream))
+            task.add_done_callback(lambda done: self._request_done(key, done))
+            self._inflight[key] = task
+        else:
+            self.metrics.record_coalesced(self.endpoint_name(url))
+        return await asyncio.shield(task)
+
+    def _request_done(self, key, task):
+        """
+        Forget a finished request, keeping a successful response for the result ttl
+        :param key: request key
+        :param task: finished request task
+        :return: none
+        """
+        self._inflight.pop(key, None)
+
+        # retrieve the error even when every caller was cancelled, so asyncio does not report it as lost
+        if task.cancelled() or task.exception() is not None or self.result_ttl <= 0:
+            return
+
+        status, data = task.result()
+        if status == StatusCode.ST_OK:
+            now = time.monotonic()
+            self._results = {k: v for k, v in self._results.items() if v[0] > now}
+            self._results[key] = (now + self.result_ttl, (status, data))
+
+    async def _request(self, url, payload=None, tag=None, schema=None, stream=False):
+        """
+        Send a GET request to the n3rgy data API.
+        :param url: request URL
+        :param payload: payload data for GET request
+        :param tag: tag for debug
+        :param schema: expected response layout
+        :param stream: decode a series response incrementally into a reading series instead of a `values` list
+        :return: (status code, response data)
+        """
+        # call n3rgy api
+        data = None
+        status, body = await self.get(url, payload, stream=stream)
+
+        # fetch data from response object
+        if status in [StatusCode.ST_OK, StatusCode.ST_PARTIAL_CONTENT]:
+            data = body if stream else self.decode(url, body, schema, tag)
+
+            # logging response data
+            if tag is not None:
+                _LOGGER.debug(f"[{tag}] Response: {data}")
+        elif status is not None:
+            # logging error
+            if tag is not None:
+                _LOGGER.warning(f"[{tag}] Invalid API request: {status}")
+
+            # access to the meter data was withdrawn or has expired
+            if status == StatusCode.ST_FORBIDDEN:
+                self.consent_lapsed = True
+
+        return (status, data)
+
+    async def fetch_range(self, url, payload, tag=None):
+        """
+        Fetch one chunk of a ranged series, following up on partial (206) responses.
+        :param url: request URL
+        :param payload: payload data including the chunk start/end
+        :param tag: tag for debug
+        :return: response data for the chunk
+        """
+        status, data = await self.request(url, payload=payload, tag=tag, schema=SCHEMA_SERIES, stream=True)
+        responses = [data]
+
+        start = follow_up_start(status, data, payload['start'], payload['end'], tag)
+        while start is not None:
+            status, data = await self.request(
+                url, payload={**payload, 'start': start}, tag=tag, schema=SCHEMA_SERIES, stream=True
+            )
+            responses.append(data)
+            start = follow_up_start(status, data, start, payload['end'], tag)
+
+        return stitch_responses(responses, payload['start'], payload['end'])
+
+    async def read_series(self, utility, reading_type, start, end, payload=None, tag=None):
+        """
+        Read a ranged series, fetching the chunks of long windows concurrently up to the concurrency cap.
+        :param utility: utility associated with the request
+        :param reading_type: reading type associated with the request
+        :param start: start date/time of the period, in the format YYYYMMDDHHmm
+        :param end: end date/time of the period, in the format YYYYMMDDHHmm
+        :param payload: extra query params
+        :param tag: tag for debug
+        :return: series data list
+        """
+        url = self.build_url(utility, reading_type, '1')
+        dates = self.get_valid_date(start, end)
+        if dates is None:
+            return (await self.request(url, payload=payload, tag=tag, schema=SCHEMA_SERIES, stream=True))[1]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(chunk_start, chunk_end):
+            """
+            Fetch a chunk once a concurrency slot is free
+            :param chunk_start: chunk start date/time
+            :param chunk_end: chunk end date/time
+            :return: response data for the chunk
+            """
+            async with semaphore:
+                return await self.fetch_range(url, {**(payload or {}), 'start': chunk_start, 'end': chunk_end}, tag=tag)
+
+        ranges = plan_ranges(start, end, self.chunk_days)
+        responses = await asyncio.gather(*[fetch(s, e) for s, e in ranges])
+        return stitch_responses(responses, start, end)
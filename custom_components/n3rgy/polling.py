@@ -0,0 +1,136 @@
+"""
+Script file: polling.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Data-arrival-aware polling scheduler for the n3rgy data integration
+"""
+
+import math
+import zlib
+
+from collections import deque
+from datetime import timedelta
+
+from .const import (
+    DEFAULT_POLL_INTERVAL,
+    MAX_POLL_INTERVAL,
+    DENSE_POLL_INTERVAL,
+    ARRIVAL_WINDOW,
+    ARRIVAL_HISTORY,
+    POLL_STAGGER
+)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def minute_of_day(now):
+    """
+    Return the minute of the day of a date/time
+    :param now: date/time object
+    :return: minute of the day
+    """
+    return now.hour * 60 + now.minute
+
+
+def get_stagger(mpxn, period=POLL_STAGGER):
+    """
+    Return a stable offset for the polls of a meter, spread evenly over the period
+    :param mpxn: meter MPxN
+    :param period: stagger period in seconds
+    :return: offset in seconds
+    """
+    if not period:
+        return 0
+    return zlib.crc32(str(mpxn).encode()) % int(period)
+
+
+class ArrivalScheduler:
+    """
+    Plan the polls of a meter around the time its data usually arrives.
+    The time of day at which new half-hours showed up is remembered for the last fetches.
+    Polls are dense within the expected arrival window, back off exponentially while nothing new
+    comes in and reset to the base interval as soon as new slots appear.
+    The first poll after the initial fetch is delayed by a per-meter offset, so that the meters of a fleet
+    set up together do not all poll at the same time.
+    """
+
+    def __init__(self, base_interval=DEFAULT_POLL_INTERVAL, max_interval=MAX_POLL_INTERVAL,
+                 dense_interval=DENSE_POLL_INTERVAL, window=ARRIVAL_WINDOW, history=ARRIVAL_HISTORY, offset=0):
+        """
+        Initialize the scheduler
+        :param base_interval: interval in seconds after new data arrived
+        :param max_interval: longest back-off interval in seconds
+        :param dense_interval: interval in seconds within the arrival window
+        :param window: half-width in minutes of the expected arrival window
+        :param history: number of arrivals remembered
+        :param offset: seconds added once to the first planned poll
+        :return: none
+        """
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.dense_interval = dense_interval
+        self.window = window
+        self.arrivals = deque(maxlen=history)
+        self.interval = base_interval
+        self.offset = offset
+        self.next_poll = None
+
+    def record(self, now, new_data):
+        """
+        Record the outcome of a fetch and plan the next one
+        :param now: current date/time
+        :param new_data: true if the fetch returned new half-hours
+        :return: interval until the next poll
+        """
+        if new_data:
+            # the batch just arrived, no need for dense polls
+            self.arrivals.append(minute_of_day(now))
+            self.interval = self.base_interval
+            interval = timedelta(seconds=self.base_interval)
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+            interval = timedelta(seconds=self.next_interval(now))
+
+        # spread the first polls of the meters set up together
+        if self.offset:
+            interval += timedelta(seconds=self.offset)
+            self.offset = 0
+
+        self.next_poll = now + interval
+        return interval
+
+    def expected_arrival(self):
+        """
+        Return the usual arrival time as a circular mean of the recorded arrivals
+        :param: none
+        :return: minute of the day or None without history
+        """
+        if not self.arrivals:
+            return None
+
+        x = sum(math.cos(2 * math.pi * m / MINUTES_PER_DAY) for m in self.arrivals)
+        y = sum(math.sin(2 * math.pi * m / MINUTES_PER_DAY) for m in self.arrivals)
+        angle = math.atan2(y, x) % (2 * math.pi)
+        return round(angle * MINUTES_PER_DAY / (2 * math.pi)) % MINUTES_PER_DAY
+
+    def next_interval(self, now):
+        """
+        Return the seconds until the next poll
+        :param now: current date/time
+        :return: interval in seconds
+        """
+        interval = self.interval
+        expected = self.expected_arrival()
+        if expected is None:
+            return interval
+
+        # minutes until the arrival window opens
+        until_window = (expected - self.window - minute_of_day(now)) % MINUTES_PER_DAY
+        if until_window >= MINUTES_PER_DAY - 2 * self.window:
+            # inside the window
+            return self.dense_interval
+
+        # never sleep past the opening of the window
+        return max(self.dense_interval, min(interval, until_window * 60))
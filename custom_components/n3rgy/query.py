@@ -0,0 +1,127 @@
+"""
+Script file: query.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Range queries over n3rgy reading series, answered from the local data first
+"""
+
+import logging
+
+from datetime import datetime
+
+from .const import (
+    SLOT_MINUTES,
+    GAP_JOIN_SLOTS,
+    QUERY_MAX_FETCHES,
+    GRANULARITY_HALFHOUR,
+    GRANULARITY_DAY,
+    GRANULARITY_WEEK,
+    GRANULARITY_MONTH,
+    INPUT_DATETIME_FORMAT,
+    READING_DATETIME_FORMAT
+)
+from .series import ReadingSeries, as_series, to_epoch_minute, from_epoch_minute
+from .rollup import bucket_totals, day_boundaries, week_boundaries, month_boundaries
+from .gaps import find_gaps, count_slots
+
+_LOGGER = logging.getLogger(__name__)
+
+BOUNDARIES = {
+    GRANULARITY_DAY: day_boundaries,
+    GRANULARITY_WEEK: week_boundaries,
+    GRANULARITY_MONTH: month_boundaries
+}
+
+
+def aggregate(series, granularity):
+    """
+    Aggregate a series to the requested granularity
+    :param series: reading series
+    :param granularity: halfhour, day, week or month
+    :return: list of {timestamp, value}
+    """
+    if granularity == GRANULARITY_HALFHOUR:
+        pairs = series.items()
+    elif series:
+        pairs = bucket_totals(series, BOUNDARIES[granularity](series.first_minute, series.last_minute))
+    else:
+        pairs = []
+
+    return [
+        {'timestamp': datetime.strftime(from_epoch_minute(minute), READING_DATETIME_FORMAT), 'value': round(value, 3)}
+        for minute, value in pairs
+    ]
+
+
+async def async_query(coordinator, utility, reading_type, start, end, granularity=GRANULARITY_HALFHOUR):
+    """
+    Read a series over an arbitrary range without touching the window of the coordinator.
+    Slots held in memory or in the archive are served locally, only the missing sub-ranges are
+    requested from the api and written back to the archive.
+    :param coordinator: n3rgy data coordinator of the property
+    :param utility: utility type
+    :param reading_type: reading type
+    :param start: range start date/time
+    :param end: range end date/time
+    :param granularity: halfhour, day, week or month
+    :return: query result dict
+    """
+    read = coordinator.readers.get(reading_type)
+    if read is None:
+        raise ValueError(f"Unsupported reading type: {reading_type}")
+
+    hass = coordinator.hass
+    archive = coordinator.archive
+    key = (coordinator.api.mpxn, utility, reading_type)
+    start_minute = to_epoch_minute(start)
+    start_minute -= start_minute % SLOT_MINUTES
+    end_minute = to_epoch_minute(end)
+
+    # local data first: the hot window held by the coordinator, then the archive segments
+    series, unit = coordinator.local_series(key, start_minute, end_minute)
+    if coordinator.segments is not None:
+        series = series.merge(await coordinator.segments.async_read(key, start_minute, end_minute))
+    elif archive is not None:
+        rows = await hass.async_add_executor_job(archive.read_range, key, start_minute, end_minute)
+        series = series.merge(ReadingSeries.from_pairs(rows))
+    if archive is not None:
+        if unit is None:
+            unit = await hass.async_add_executor_job(archive.read_unit, key)
+
+    # the meter cannot hold slots from the future
+    last_minute = min(end_minute, to_epoch_minute(datetime.now()))
+    gaps = find_gaps(series, start_minute, last_minute, GAP_JOIN_SLOTS)
+    fetched = gaps[:QUERY_MAX_FETCHES]
+    for first, last in fetched:
+        str_start = datetime.strftime(from_epoch_minute(first), INPUT_DATETIME_FORMAT)
+        str_end = datetime.strftime(from_epoch_minute(last), INPUT_DATETIME_FORMAT)
+        try:
+            data = await read(utility, str_start, str_end)
+        except ValueError as err:
+            _LOGGER.warning(f"[QUERY] Error: {str(err)}")
+            continue
+
+        if isinstance(data, dict) and data.get('unit'):
+            unit = data['unit']
+        update = as_series(data).slice(first, last)
+        if update:
+            series = series.merge(update)
+            if archive is not None:
+                await coordinator.async_append_archive(key, list(update.items()))
+        _LOGGER.debug(f"[QUERY] {utility}/{reading_type} ({str_start}-{str_end}): {len(update)} readings")
+
+    return {
+        'mpxn': coordinator.api.mpxn,
+        'utility': utility,
+        'reading_type': reading_type,
+        'start': datetime.strftime(from_epoch_minute(start_minute), INPUT_DATETIME_FORMAT),
+        'end': datetime.strftime(from_epoch_minute(end_minute), INPUT_DATETIME_FORMAT),
+        'granularity': granularity,
+        'unit': unit,
+        'total': round(series.total(), 3),
+        'fetched': len(fetched),
+        'missing': count_slots(find_gaps(series, start_minute, last_minute)),
+        'values': aggregate(series, granularity)
+    }
@@ -0,0 +1,203 @@
+"""
+Script file: rollup.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Batched aggregations over n3rgy half-hourly reading series
+"""
+
+from datetime import datetime
+
+from .const import (
+    SLOT_MINUTES,
+    DEFAULT_BASE_LOAD_SLOTS,
+    DEFAULT_PERCENTILES
+)
+from .series import as_series, to_epoch_minute, from_epoch_minute
+
+MINUTES_PER_DAY = 24 * 60
+SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES
+
+
+def bucket_totals(series, boundaries):
+    """
+    Sum the readings between consecutive boundaries using the running totals
+    :param series: reading series
+    :param boundaries: ascending bucket start minutes, the last item closes the final bucket
+    :return: list of (bucket start minute, total)
+    """
+    totals = series.totals
+    result = []
+    lo = series.bounds(boundaries[0], None)[0] if boundaries else 0
+    for index in range(len(boundaries) - 1):
+        hi = series.bounds(None, boundaries[index + 1] - 1)[1]
+        if hi > lo:
+            result.append((boundaries[index], totals[hi] - totals[lo]))
+        lo = hi
+    return result
+
+
+def day_boundaries(first, last):
+    """
+    Midnight boundaries covering a minute range
+    :param first: first epoch minute
+    :param last: last epoch minute
+    :return: list of day start minutes, closed by the day after `last`
+    """
+    start = first - first % MINUTES_PER_DAY
+    return list(range(start, last + MINUTES_PER_DAY - last % MINUTES_PER_DAY + 1, MINUTES_PER_DAY))
+
+
+def week_boundaries(first, last):
+    """
+    Monday midnight boundaries covering a minute range
+    :param first: first epoch minute
+    :param last: last epoch minute
+    :return: list of week start minutes, closed by the week after `last`
+    """
+    week = 7 * MINUTES_PER_DAY
+    # the epoch was a Thursday
+    offset = 3 * MINUTES_PER_DAY
+    start = first - (first + offset) % week
+    end = last - (last + offset) % week + week
+    return list(range(start, end + 1, week))
+
+
+def month_boundaries(first, last):
+    """
+    First-of-month boundaries covering a minute range
+    :param first: first epoch minute
+    :param last: last epoch minute
+    :return: list of month start minutes, closed by the month after `last`
+    """
+    dt_first = from_epoch_minute(first)
+    dt_last = from_epoch_minute(last)
+    year, month = dt_first.year, dt_first.month
+    boundaries = []
+    while (year, month) <= (dt_last.year, dt_last.month):
+        boundaries.append(to_epoch_minute(datetime(year, month, 1)))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    boundaries.append(to_epoch_minute(datetime(year, month, 1)))
+    return boundaries
+
+
+def daily_totals(series):
+    """
+    Per-day totals
+    :param series: reading series
+    :return: list of (day start minute, total)
+    """
+    if not series:
+        return []
+    return bucket_totals(series, day_boundaries(series.first_minute, series.last_minute))
+
+
+def weekly_totals(series):
+    """
+    Per-week totals, weeks starting on Monday
+    :param series: reading series
+    :return: list of (week start minute, total)
+    """
+    if not series:
+        return []
+    return bucket_totals(series, week_boundaries(series.first_minute, series.last_minute))
+
+
+def monthly_totals(series):
+    """
+    Per-month totals
+    :param series: reading series
+    :return: list of (month start minute, total)
+    """
+    if not series:
+        return []
+    return bucket_totals(series, month_boundaries(series.first_minute, series.last_minute))
+
+
+def peak(series):
+    """
+    Highest half-hour reading
+    :param series: reading series
+    :return: (minute, value) or None
+    """
+    if not series:
+        return None
+    value = max(series.values)
+    return (series.minutes[series.values.index(value)], value)
+
+
+def base_load(series, slots=DEFAULT_BASE_LOAD_SLOTS):
+    """
+    Minimum rolling average over a number of consecutive readings
+    :param series: reading series
+    :param slots: rolling window length in readings
+    :return: (window start minute, average) or None
+    """
+    if len(series) < slots:
+        return None
+    totals = series.totals
+    window_sums = [totals[i + slots] - totals[i] for i in range(len(series) - slots + 1)]
+    value = min(window_sums)
+    return (series.minutes[window_sums.index(value)], value / slots)
+
+
+def percentiles(series, points=DEFAULT_PERCENTILES):
+    """
+    Percentiles of the half-hour readings, linearly interpolated
+    :param series: reading series
+    :param points: percentiles to compute (0-100)
+    :return: dict of percentile to value
+    """
+    if not series:
+        return {}
+    ordered = sorted(series.values)
+    last = len(ordered) - 1
+    result = {}
+    for point in points:
+        rank = last * point / 100
+        lo = int(rank)
+        hi = min(lo + 1, last)
+        result[point] = ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+    return result
+
+
+def day_of_week_profile(series):
+    """
+    Average reading per half-hour slot for each day of the week
+    :param series: reading series
+    :return: dict of weekday (0 = Monday) to list of slot averages
+    """
+    sums = [[0.0] * SLOTS_PER_DAY for _ in range(7)]
+    counts = [[0] * SLOTS_PER_DAY for _ in range(7)]
+    for minute, value in series.items():
+        day, offset = divmod(minute, MINUTES_PER_DAY)
+        # the epoch was a Thursday
+        weekday = (day + 3) % 7
+        slot = offset // SLOT_MINUTES
+        sums[weekday][slot] += value
+        counts[weekday][slot] += 1
+
+    return {
+        weekday: [s / c if c else None for s, c in zip(sums[weekday], counts[weekday])]
+        for weekday in range(7)
+        if any(counts[weekday])
+    }
+
+
+def compute_rollups(data):
+    """
+    Compute every rollup of a consumption series in one go
+    :param data: reading series or n3rgy consumption payload
+    :return: dict of rollups
+    """
+    series = as_series(data)
+    return {
+        'daily': daily_totals(series),
+        'weekly': weekly_totals(series),
+        'monthly': monthly_totals(series),
+        'peak': peak(series),
+        'base_load': base_load(series),
+        'percentiles': percentiles(series),
+        'day_of_week': day_of_week_profile(series)
+    }
@@ -1,57 +1,57 @@
 """
 Script file: sensor.py
 Created on: Jan 29, 2021
-Last modified on: Feb 24, 2021
+Last modified on: Oct 17, 2026
 
 Comments:
     Support for n3rgy data sensor
 """
 
+import asyncio
 import logging
 
-from datetime import datetime, timedelta
-from homeassistant.helpers.entity import Entity
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers import entity_registry
+from homeassistant.helpers.entity import Entity, EntityCategory
 
 from homeassistant.const import(
     ATTR_ATTRIBUTION,
-    CONF_HOST,
     CONF_API_KEY,
     CONF_NAME
 )
 from .const import (
+    DOMAIN,
+    DATA_CLIENT,
+    DATA_ARCHIVE,
+    DATA_COORDINATOR,
+    DATA_SEGMENTS,
     CONF_PROPERTY_ID,
     CONF_ENVIRONMENT,
-    CONF_DAILY_UPDATE,
-    CONF_UTILITY,
-    CONF_START,
-    CONF_END,
+    CONF_BACKFILL,
 
-    PLATFORM,
     ATTRIBUTION,
     SENSOR_NAME,
     SENSOR_TYPE,
+    SENSOR_TYPE_COST,
     ICON,
+    ICON_COST,
+    METRIC_SENSORS,
 
     DEFAULT_NAME,
     DEFAULT_LIVE_ENVIRONMENT,
-    DEFAULT_DAILY_UPDATE,
+    DEFAULT_BACKFILL,
     DEFAULT_DEVICE_TYPE,
-    UTILITY_ELECTRICITY,
+    READING_TYPE_CONSUMPTION,
 
-    INPUT_DATETIME_FORMAT,
-    ATTR_DATETIME_FORMAT,
-
-    ATTR_START_DATETIME,
-    ATTR_END_DATETIME,
     ATTR_DEVICE_TYPE,
 
     GRANT_CONSENT_READY
 )
-from .n3rgy_api import N3rgyDataApi, N3rgyGrantConsent
+from .n3rgy_api import N3rgyAsyncGrantConsent
+from .consent import N3rgyConsent
+from .coordinator import N3rgyDataCoordinator
+from .backfill import N3rgyBackfill
+from .snapshot import SNAPSHOT_SERIES, SNAPSHOT_COST
 
-# set scan interval as 2 mins
-SCAN_INTERVAL = timedelta(seconds=1800)
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -63,81 +63,104 @@ async def async_setup_entry(hass, entry, async_add_entities):
     :return: none
     """
     # in-line function
-    async def async_update_data():
-        """
-        Fetch data from n3rgy API
-        This is the place to pre-process the data to lookup tables so entities can quickly look up their data
-        :param: none
-        :return: power consumption data
-        """
-        return await hass.async_add_executor_job(read_consumption, api, entry)
-
     async def async_initialize():
         """
         Initialize objects from n3rgy API
         :param: none
-        :return: data coordinator, device type
+        :return: data coordinator, device name, device type, series keys
         """
-        coordinator = DataUpdateCoordinator(
-            hass,
-            _LOGGER,
-            name=PLATFORM,
-            update_method=async_update_data
+        coordinator = N3rgyDataCoordinator(
+            hass, api, entry, hass.data[DOMAIN][DATA_ARCHIVE], consent=consent, segments=hass.data[DOMAIN][DATA_SEGMENTS]
         )
 
-        # fetch initial data so we have data when entities subscribe
-        sensor_name, device_type = await hass.async_add_executor_job(get_device_info, api, entry)
-        await coordinator.async_refresh()
-        return (coordinator, sensor_name, device_type)
+        # the device lookup and the series discovery are served from the metadata cache
+        (sensor_name, device_type), series_keys = await asyncio.gather(
+            async_get_device_info(coordinator.metadata, entry),
+            coordinator.async_discover()
+        )
+        return (coordinator, sensor_name, device_type, series_keys)
 
     # initialize n3rgy API
     device_type = None
-    api = init_api_client(entry)
+    consent = None
+    api = hass.data[DOMAIN][DATA_CLIENT][entry.entry_id]
 
     # grant consent options
     if GRANT_CONSENT_READY:
-        # grant consent is enabled for live environment
-        if process_grant_consent(entry):
-            coordinator, sensor_name, device_type = await async_initialize()
-    else:
-        # grant consent is disabled
-        coordinator, sensor_name, device_type = await async_initialize()
-
-    # add sensor
-    async_add_entities([N3rgySensor(coordinator, sensor_name, device_type)], False)
-
-
-def init_api_client(config_entry):
+        # grant consent is enabled for live environment, a persisted consent is reused
+        consent = init_grant_consent(hass, api, entry)
+        if not await consent.async_ensure():
+            _LOGGER.warning("[CONSENT] Grant consent failed, no sensors added")
+            return
+
+    coordinator, sensor_name, device_type, series_keys = await async_initialize()
+    hass.data[DOMAIN][DATA_COORDINATOR][entry.entry_id] = coordinator
+    await async_migrate_unique_ids(hass, entry, coordinator)
+
+    # add one sensor per series, a cost sensor per consumption series and the diagnostic sensors
+    entities = [N3rgySensor(coordinator, key, sensor_name, device_type) for key in series_keys]
+    entities.extend(
+        N3rgyCostSensor(coordinator, key, sensor_name, device_type)
+        for key in series_keys
+        if key[1] == READING_TYPE_CONSUMPTION
+    )
+    entities.extend(N3rgyMetricSensor(coordinator, metric, sensor_name, device_type) for metric in METRIC_SENSORS)
+    async_add_entities(entities, False)
+
+    # the first fetch runs in the background, a fleet set up at once queues on the shared rate limiter
+    # instead of holding up the platform setup, and the entities fill in as their data arrives
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {api.mpxn}"
+    )
+
+    # walk the archive back through the meter history in the background
+    if entry.options.get(CONF_BACKFILL, DEFAULT_BACKFILL):
+        backfill = N3rgyBackfill(hass, coordinator)
+        backfill.start()
+        entry.async_on_unload(backfill.stop)
+
+
+async def async_migrate_unique_ids(hass, config_entry, coordinator):
     """
-    Initialize n3rgy data API client
+    Move the single usage and cost entities of earlier versions to the unique ids of their series
+    The entity ids, history and dashboard references are kept
+    :param hass: hass object
     :param config_entry: config entry
-    :return n3rgy data api client instance
+    :param coordinator: data coordinator object
+    :return: none
     """
-    # read the configuration data
-    host = None
-    api_key = None
-    property_id = None
+    registry = entity_registry.async_get(hass)
+    prefix = f"{coordinator.api.mpxn}_{coordinator.utility}"
+    unique_ids = {
+        SENSOR_TYPE: f"{prefix}_{READING_TYPE_CONSUMPTION}",
+        SENSOR_TYPE_COST: f"{prefix}_{SENSOR_TYPE_COST}"
+    }
 
-    # check the input data
-    if config_entry.data:
-        host = config_entry.data.get(CONF_HOST)
-        api_key = config_entry.data.get(CONF_API_KEY)
-        property_id = config_entry.data.get(CONF_PROPERTY_ID)
-    
-    # initialize n3rgy data API client
-    api_instance = None
-    try:
-        api_instance = N3rgyDataApi(host, api_key, property_id)
-    except ValueError as err:
-        _LOGGER.warning(f"[INIT_API_CLIENT] Error: {str(err)}")
-    finally:
-        return api_instance
+    # in-line function
+    def migrate(entity_entry):
+        """
+        Return the new unique id of a registry entry
+        :param entity_entry: entity registry entry
+        :return: dict of changes or None
+        """
+        unique_id = unique_ids.get(entity_entry.unique_id)
+        if unique_id is None:
+            return None
 
+        # an entity already created under the new id keeps it
+        if registry.async_get_entity_id(entity_entry.domain, entity_entry.platform, unique_id):
+            return None
 
-def get_device_info(api, config_entry):
+        _LOGGER.info(f"[MIGRATE] {entity_entry.entity_id}: {entity_entry.unique_id} -> {unique_id}")
+        return {'new_unique_id': unique_id}
+
+    await entity_registry.async_migrate_entries(hass, config_entry.entry_id, migrate)
+
+
+async def async_get_device_info(metadata, config_entry):
     """
     Get sensor information
-    :param api: n3rgy api client
+    :param metadata: n3rgy metadata cache
     :param config_entry: config entry
     :return: (device name, smarte meter type)
     """
@@ -153,18 +176,21 @@ def get_device_info(api, config_entry):
     # get smart meter type
     device_type = None
     try:
-        device_type = api.find_mxpn(property_id)
+        device_type = await metadata.async_find_mxpn(property_id)
     except ValueError as err:
         _LOGGER.warning(f"[GET_TYPE] Error: {str(err)}")
     finally:
         return (sensor_name, device_type)
 
 
-def process_grant_consent(config_entry):
+def init_grant_consent(hass, api, config_entry):
     """
-    Grant consent process
+    Initialize the grant consent of an entry
+    Requests share the connection pool and the request scheduler of the data client
+    :param hass: hass object
+    :param api: n3rgy async api client
     :param config_entry: config entry
-    :return: True if successful, False otherwise
+    :return: persisted grant consent
     """
     # read the configuration data
     api_key = None
@@ -179,77 +205,31 @@ def process_grant_consent(config_entry):
     if config_entry.options:
         live_env = config_entry.options.get(CONF_ENVIRONMENT)
 
-    # select get operation authorization base url
-    consent_token_base_url = 'https://consentsandbox.data.n3rgy.com'
-    if live_env:
-        consent_token_base_url = 'https://consent.data.n3rgy.com'
-
-    # call api
-    consent = N3rgyGrantConsent(property_id, api_key)
-    session_id = consent.get_operation_authorization_token(consent_token_base_url)
-    if session_id:
-        # select handover base URL
-        handover_base_url = 'https://portal-consent-sandbox.data.n3rgy.com/'
-        if live_env:
-            handover_base_url = 'https://portal-consent.data.n3rgy.com'
-
-        # define return/error url to be redirected
-        return_url = 'https://cloudkb.co.uk'
-        error_url = 'https://cloudkb.co.uk'
-        return consent.invocation_endpoint_url(handover_base_url, session_id, 'ihdmac_full', return_url, error_url)
-
-    # failed
-    return False
-
-
-def read_consumption(api, config_entry):
-    """
-    List consumption values for an utility type on the provided accessible property, within a certain time frame
-    :param api: n3rgy api client
-    :param config_entry: config entry
-    :return: consumption data list
-    """
-    # read the configuration data
-    utility = UTILITY_ELECTRICITY
-    daily_update = DEFAULT_DAILY_UPDATE
-    start = None
-    end = None
-
-    # check options
-    if config_entry.options:
-        utility = config_entry.options.get(CONF_UTILITY)
-        daily_update = config_entry.options.get(CONF_DAILY_UPDATE)
-        if not daily_update:
-            start = config_entry.options.get(CONF_START)
-            end = config_entry.options.get(CONF_END)
-
-    # get power consumption data
-    data = None
-    try:
-        data = api.read_consumption(utility, start, end)
-        _LOGGER.info(f"[READ_CONSUMPTION] Grabbed consumption data: ({start}-{end})")
-    except ValueError as ex:
-        _LOGGER.warning(f"[READ_CONSUMPTION] Error: {str(err)}")
-    finally:
-        return data
+    consent = N3rgyAsyncGrantConsent(property_id, api_key, session=api.session, scheduler=api.scheduler)
+    return N3rgyConsent(hass, consent, live_env)
 
 
 class N3rgySensor(Entity):
     """Implementation of a n3rgy data sensor"""
 
-    def __init__(self, coordinator, sensor_name, device_type):
+    _snapshot_type = SNAPSHOT_SERIES
+
+    def __init__(self, coordinator, series_key, sensor_name, device_type):
         """
         Initialize n3rgy data sensor class
         :param coordinator: data coordinator object
+        :param series_key: (utility, reading type) of the series
         :param sensor_name: device name
         :param device_type: smart meter type
         :return: none
         """
-        self._name = sensor_name
-        self._type = SENSOR_TYPE
-        self._state = None
+        utility, reading_type = series_key
+        self._name = f"{sensor_name} {utility} {reading_type}"
+        self._type = f"{utility}_{reading_type}"
+        self._series_key = series_key
         self._coordinator = coordinator
         self._device_type = DEFAULT_DEVICE_TYPE
+        self._written = None
 
         # parameter validation
         if device_type is not None:
@@ -271,7 +251,30 @@ class N3rgySensor(Entity):
         :param: none
         :return: unique id
         """
-        return self._type
+        return f"{self._coordinator.api.mpxn}_{self._type}"
+
+    @property
+    def _data(self):
+        """
+        Return the coordinator data of the sensor series
+        :param: none
+        :return: series data or None
+        """
+        if self._coordinator.data:
+            return self._coordinator.data.get(self._series_key)
+        return None
+
+    @property
+    def _snapshot(self):
+        """
+        Return the snapshot of the sensor built by the last refresh
+        :param: none
+        :return: snapshot or None
+        """
+        data = self._data
+        if data:
+            return data['snapshots'].get(self._snapshot_type)
+        return None
 
     @property
     def state(self):
@@ -280,7 +283,8 @@ class N3rgySensor(Entity):
         :param: none
         :return: sensor state
         """
-        return self._state
+        snapshot = self._snapshot
+        return snapshot.state if snapshot else None
 
     @property
     def icon(self):
@@ -298,47 +302,33 @@ class N3rgySensor(Entity):
         :param: none
         :return: data unit
         """
-        if self._coordinator.data:
-            return self._coordinator.data['unit']
-        return None
+        snapshot = self._snapshot
+        return snapshot.unit if snapshot else None
 
     @property
     def should_poll(self):
         """
-        Need to poll.
+        No need to poll.
         Coordinator notifies entity of updates
         :param: none
         :return: false
         """
-        return True
+        return False
 
     @property
-    def device_state_attributes(self):
+    def extra_state_attributes(self):
         """
         Return the state attributes
         :param: none
         :return: state attributes
         """
-        attributes = {
-            ATTR_DEVICE_TYPE: self._device_type,
-            ATTR_ATTRIBUTION: ATTRIBUTION
-        }
-
-        if not self._coordinator.data:
-            return attributes
-
-        # reformat date/time
-        try:
-            str_start = self._coordinator.data['start']
-            str_end = self._coordinator.data['end']
-            dt_start = datetime.strptime(str_start, INPUT_DATETIME_FORMAT)
-            dt_end = datetime.strptime(str_end, INPUT_DATETIME_FORMAT)
-            attributes[ATTR_START_DATETIME] = datetime.strftime(dt_start, ATTR_DATETIME_FORMAT)
-            attributes[ATTR_END_DATETIME] = datetime.strftime(dt_end, ATTR_DATETIME_FORMAT)
-        except:
-            _LOGGER.warning("Failed to reformat datetime object")
-
-        return attributes
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {
+                ATTR_DEVICE_TYPE: self._device_type,
+                ATTR_ATTRIBUTION: ATTRIBUTION
+            }
+        return {ATTR_DEVICE_TYPE: self._device_type, **snapshot.attributes}
 
     @property
     def available(self):
@@ -349,36 +339,147 @@ class N3rgySensor(Entity):
         """
         return self._coordinator.last_update_success
 
-    def update_state(self):
+    async def async_added_to_hass(self):
         """
-        Calculate the consumption data
+        When entity is added to hass
         :param: none
         :return: none
         """
-        if self._coordinator.data:
-            # get consumption value
-            value_list = self._coordinator.data['values']
-            values = [v['value'] for v in value_list]
-            self._state = f"{sum(values):.2f}"
+        # home assistant writes the initial state right after this call
+        self._written = self._signature()
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._handle_coordinator_update)
+        )
 
-    async def async_added_to_hass(self):
+    def _signature(self):
         """
-        When entity is added to hass
+        Return what the written state depends on
+        Snapshots are immutable, so comparing them compares state, unit and attributes
+        :param: none
+        :return: comparable signature
+        """
+        return (self.available, self._device_type, self._snapshot)
+
+    def _handle_coordinator_update(self):
+        """
+        Write the state only when the value, attributes or availability changed
         :param: none
         :return: none
         """
-        self.async_on_remove(
-            self._coordinator.async_add_listener(self.async_write_ha_state)
-        )
-        self.update_state()
+        signature = self._signature()
+        if signature == self._written:
+            return
+        self._written = signature
+        self.async_write_ha_state()
+
+
+class N3rgyCostSensor(N3rgySensor):
+    """Implementation of a n3rgy data cost sensor"""
 
-    async def async_update(self):
+    _snapshot_type = SNAPSHOT_COST
+
+    def __init__(self, coordinator, series_key, sensor_name, device_type):
         """
-        Update the entity
-        Only used by the generic entity update service
+        Initialize n3rgy data cost sensor class
+        :param coordinator: data coordinator object
+        :param series_key: (utility, reading type) of the consumption series
+        :param sensor_name: device name
+        :param device_type: smart meter type
+        :return: none
+        """
+        super().__init__(coordinator, series_key, sensor_name, device_type)
+        self._name = f"{sensor_name} {series_key[0]} {SENSOR_TYPE_COST}"
+        self._type = f"{series_key[0]}_{SENSOR_TYPE_COST}"
+
+    @property
+    def icon(self):
+        """
+        Icon for each sensor
         :param: none
+        :return: sensor icon
+        """
+        return ICON_COST
+
+
+class N3rgyMetricSensor(N3rgySensor):
+    """Diagnostic sensor reporting one performance metric of the n3rgy client"""
+
+    def __init__(self, coordinator, metric, sensor_name, device_type):
+        """
+        Initialize n3rgy data metric sensor class
+        :param coordinator: data coordinator object
+        :param metric: metric key of METRIC_SENSORS
+        :param sensor_name: device name
+        :param device_type: smart meter type
         :return: none
         """
-        _LOGGER.info("[ENTITY] Async updated")
-        await self._coordinator.async_request_refresh()
-        self.update_state()
+        super().__init__(coordinator, (None, None), sensor_name, device_type)
+        label, self._unit, self._icon = METRIC_SENSORS[metric]
+        self._metric = metric
+        self._name = f"{sensor_name} {label}"
+        self._type = f"metric_{metric}"
+
+    @property
+    def icon(self):
+        """
+        Icon for each sensor
+        :param: none
+        :return: sensor icon
+        """
+        return self._icon
+
+    @property
+    def unit_of_measurement(self):
+        """
+        Return the unit of measurement of this entity, if any
+        :param: none
+        :return: metric unit
+        """
+        return self._unit
+
+    @property
+    def entity_category(self):
+        """
+        Return the entity category
+        :param: none
+        :return: diagnostic category
+        """
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def extra_state_attributes(self):
+        """
+        Return the state attributes
+        :param: none
+        :return: state attributes
+        """
+        return {
+            ATTR_DEVICE_TYPE: self._device_type,
+            ATTR_ATTRIBUTION: ATTRIBUTION
+        }
+
+    @property
+    def available(self):
+        """
+        Metrics stay available when a refresh fails
+        :param: none
+        :return: true
+        """
+        return True
+
+    @property
+    def state(self):
+        """
+        Return the current value of the metric
+        :param: none
+        :return: sensor state
+        """
+        return self._coordinator.api.metrics.summary()[self._metric]
+
+    def _signature(self):
+        """
+        Return what the written state depends on
+        :param: none
+        :return: comparable signature
+        """
+        return (self.available, self.state)
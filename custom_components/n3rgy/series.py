@@ -0,0 +1,230 @@
+"""
+Script file: series.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Compact columnar representation of n3rgy reading series
+"""
+
+import calendar
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_minute(timestamp):
+    """
+    Convert a naive reading date/time to minutes since the epoch
+    :param timestamp: date/time object
+    :return: epoch minute
+    """
+    return calendar.timegm(timestamp.timetuple()) // 60
+
+
+def from_epoch_minute(minute):
+    """
+    Convert minutes since the epoch back to a naive reading date/time
+    :param minute: epoch minute
+    :return: date/time object
+    """
+    return EPOCH + timedelta(minutes=minute)
+
+
+def parse_reading_minute(timestamp):
+    """
+    Parse a reading timestamp in the format YYYY-MM-DD HH:MM to minutes since the epoch
+    Slicing the fixed-width string is much cheaper than strptime on large payloads
+    :param timestamp: reading timestamp
+    :return: epoch minute
+    """
+    if len(timestamp) != 16 or timestamp[4] != '-' or timestamp[10] != ' ':
+        raise ValueError(f"Invalid reading timestamp: {timestamp}")
+    return calendar.timegm((
+        int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+        int(timestamp[11:13]), int(timestamp[14:16]), 0
+    )) // 60
+
+
+class ReadingSeries:
+    """
+    Sorted, de-duplicated reading series backed by parallel arrays:
+    epoch minutes in a signed 64-bit int array and values in a double array.
+    Range lookups bisect the minute array and totals come from cached running sums.
+    """
+
+    __slots__ = ('minutes', 'values', '_totals')
+
+    def __init__(self, minutes=None, values=None):
+        """
+        Initialize a reading series from already sorted, unique minutes
+        :param minutes: epoch minutes
+        :param values: reading values
+        :return: none
+        """
+        self.minutes = minutes if isinstance(minutes, array) else array('q', minutes or [])
+        self.values = values if isinstance(values, array) else array('d', values or [])
+        self._totals = None
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """
+        Build a series from unordered (epoch minute, value) pairs, later pairs win on duplicates
+        :param pairs: iterable of (epoch minute, value)
+        :return: reading series
+        """
+        slots = {}
+        for minute, value in pairs:
+            if value is not None:
+                slots[minute] = value
+        minutes = sorted(slots)
+        return cls(array('q', minutes), array('d', [slots[m] for m in minutes]))
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Build a series from the `values` list of an n3rgy response
+        :param values: list of {'timestamp': ..., 'value': ...}
+        :return: reading series
+        """
+        pairs = []
+        for entry in values or []:
+            try:
+                pairs.append((parse_reading_minute(entry['timestamp']), entry['value']))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return cls.from_pairs(pairs)
+
+    def __len__(self):
+        """
+        Return the number of readings
+        :param: none
+        :return: series length
+        """
+        return len(self.minutes)
+
+    @property
+    def first_minute(self):
+        """
+        Return the oldest reading minute
+        :param: none
+        :return: epoch minute or None
+        """
+        return self.minutes[0] if self.minutes else None
+
+    @property
+    def last_minute(self):
+        """
+        Return the newest reading minute
+        :param: none
+        :return: epoch minute or None
+        """
+        return self.minutes[-1] if self.minutes else None
+
+    @property
+    def totals(self):
+        """
+        Return the running totals, totals[i] being the sum of the first i values
+        :param: none
+        :return: double array of len(series) + 1 items
+        """
+        if self._totals is None:
+            self._totals = array('d', accumulate(self.values, initial=0.0))
+        return self._totals
+
+    def bounds(self, start=None, end=None):
+        """
+        Return the index range covering a time range
+        :param start: first epoch minute (inclusive)
+        :param end: last epoch minute (inclusive)
+        :return: (first index, last index + 1)
+        """
+        lo = 0 if start is None else bisect_left(self.minutes, start)
+        hi = len(self.minutes) if end is None else bisect_right(self.minutes, end)
+        return (lo, max(lo, hi))
+
+    def slice(self, start=None, end=None):
+        """
+        Return the readings within a time range
+        :param start: first epoch minute (inclusive)
+        :param end: last epoch minute (inclusive)
+        :return: reading series
+        """
+        lo, hi = self.bounds(start, end)
+        if lo == 0 and hi == len(self.minutes):
+            return self
+        return ReadingSeries(self.minutes[lo:hi], self.values[lo:hi])
+
+    def total(self, start=None, end=None):
+        """
+        Return the sum of the readings within a time range
+        :param start: first epoch minute (inclusive)
+        :param end: last epoch minute (inclusive)
+        :return: total
+        """
+        lo, hi = self.bounds(start, end)
+        totals = self.totals
+        return totals[hi] - totals[lo]
+
+    def get(self, minute):
+        """
+        Return the reading of a slot
+        :param minute: epoch minute
+        :return: value or None
+        """
+        index = bisect_left(self.minutes, minute)
+        if index < len(self.minutes) and self.minutes[index] == minute:
+            return self.values[index]
+        return None
+
+    def merge(self, other):
+        """
+        Merge another series into a new one, the other series wins on duplicates
+        :param other: reading series
+        :return: reading series
+        """
+        if not other:
+            return self
+        if not self:
+            return other
+
+        # appending newer slots is the common case
+        if other.first_minute > self.last_minute:
+            return ReadingSeries(self.minutes + other.minutes, self.values + other.values)
+
+        return ReadingSeries.from_pairs(list(zip(self.minutes, self.values)) + list(zip(other.minutes, other.values)))
+
+    def changed(self, other):
+        """
+        Return the slots of another series that are new or differ from this one
+        :param other: reading series
+        :return: list of (epoch minute, value)
+        """
+        return [(m, v) for m, v in zip(other.minutes, other.values) if self.get(m) != v]
+
+    def items(self):
+        """
+        Iterate over the readings
+        :param: none
+        :return: iterator of (epoch minute, value)
+        """
+        return zip(self.minutes, self.values)
+
+
+def as_series(data):
+    """
+    Accept either a reading series or an n3rgy consumption payload
+    :param data: reading series or response data with a `values` list
+    :return: reading series
+    """
+    if isinstance(data, ReadingSeries):
+        return data
+    if isinstance(data, dict):
+        if isinstance(data.get('series'), ReadingSeries):
+            return data['series']
+        return ReadingSeries.from_values(data.get('values'))
+    return ReadingSeries()
@@ -0,0 +1,100 @@
+"""
+Script file: snapshot.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Immutable entity snapshots built once per refresh
+"""
+
+import logging
+
+from collections import namedtuple
+from datetime import datetime
+from types import MappingProxyType
+
+from homeassistant.const import ATTR_ATTRIBUTION
+
+from .const import (
+    ATTRIBUTION,
+    SENSOR_TYPE_COST,
+    COST_UNIT,
+    PENCE_PER_POUND,
+    INPUT_DATETIME_FORMAT,
+    ATTR_DATETIME_FORMAT,
+    ATTR_START_DATETIME,
+    ATTR_END_DATETIME,
+    ATTR_PEAK,
+    ATTR_PEAK_DATETIME,
+    ATTR_BASE_LOAD,
+    ATTR_ENERGY_COST,
+    ATTR_STANDING_CHARGE,
+    ATTR_MISSING_SLOTS
+)
+from .series import from_epoch_minute
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_SERIES = "series"
+SNAPSHOT_COST = SENSOR_TYPE_COST
+
+# state, unit and read-only attributes of an entity, precomputed for one refresh
+Snapshot = namedtuple('Snapshot', ['state', 'unit', 'attributes'])
+
+
+def series_attributes(data):
+    """
+    Format the attributes of a series dataset
+    :param data: series data
+    :return: attributes dict
+    """
+    attributes = {ATTR_ATTRIBUTION: ATTRIBUTION}
+
+    # reformat date/time
+    try:
+        dt_start = datetime.strptime(data['start'], INPUT_DATETIME_FORMAT)
+        dt_end = datetime.strptime(data['end'], INPUT_DATETIME_FORMAT)
+        attributes[ATTR_START_DATETIME] = datetime.strftime(dt_start, ATTR_DATETIME_FORMAT)
+        attributes[ATTR_END_DATETIME] = datetime.strftime(dt_end, ATTR_DATETIME_FORMAT)
+    except (KeyError, TypeError, ValueError):
+        _LOGGER.warning("Failed to reformat datetime object")
+
+    # peak and base load rollups
+    rollups = data['rollups']
+    if rollups['peak'] is not None:
+        minute, value = rollups['peak']
+        attributes[ATTR_PEAK] = round(value, 3)
+        attributes[ATTR_PEAK_DATETIME] = datetime.strftime(from_epoch_minute(minute), ATTR_DATETIME_FORMAT)
+    if rollups['base_load'] is not None:
+        attributes[ATTR_BASE_LOAD] = round(rollups['base_load'][1], 3)
+
+    # slots the meter has not delivered yet
+    attributes[ATTR_MISSING_SLOTS] = data['missing']
+    return attributes
+
+
+def build_snapshots(data):
+    """
+    Build the entity snapshots of a series dataset
+    :param data: series data
+    :return: read-only dict of snapshot type to snapshot
+    """
+    attributes = series_attributes(data)
+    snapshots = {
+        SNAPSHOT_SERIES: Snapshot(
+            f"{data['total']:.2f}", data['unit'], MappingProxyType(attributes)
+        )
+    }
+
+    cost = data.get('cost')
+    if cost:
+        snapshots[SNAPSHOT_COST] = Snapshot(
+            f"{cost['total'] / PENCE_PER_POUND:.2f}",
+            COST_UNIT,
+            MappingProxyType({
+                **attributes,
+                ATTR_ENERGY_COST: round(cost['energy'] / PENCE_PER_POUND, 2),
+                ATTR_STANDING_CHARGE: round(cost['standing'] / PENCE_PER_POUND, 2)
+            })
+        )
+    return MappingProxyType(snapshots)
@@ -0,0 +1,162 @@
+"""
+Script file: statistics.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Import of n3rgy readings into the Home Assistant long-term statistics
+"""
+
+import logging
+
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+    statistics_during_period
+)
+
+from .const import DOMAIN, STATISTICS_LOOKBACK
+
+_LOGGER = logging.getLogger(__name__)
+
+MINUTES_PER_HOUR = 60
+
+# n3rgy units to home assistant units
+UNITS = {
+    'm3': 'm³'
+}
+
+
+def get_statistic_id(key):
+    """
+    Return the external statistic id of a series
+    :param key: series key (mpxn, utility, reading type)
+    :return: statistic id
+    """
+    return f"{DOMAIN}:{'_'.join(key)}".lower()
+
+
+def to_utc(minute):
+    """
+    Convert an epoch minute to an aware UTC date/time
+    :param minute: epoch minute
+    :return: date/time object
+    """
+    return datetime.fromtimestamp(minute * 60, tz=timezone.utc)
+
+
+def to_minute(start):
+    """
+    Convert the start of a statistics row to an epoch minute
+    :param start: timestamp, or date/time on older recorder versions
+    :return: epoch minute
+    """
+    if isinstance(start, datetime):
+        start = start.timestamp()
+    return int(start) // 60
+
+
+def hour_of(minute):
+    """
+    Return the start of the hour holding a slot
+    :param minute: epoch minute
+    :return: epoch minute
+    """
+    return minute - minute % MINUTES_PER_HOUR
+
+
+async def async_last_statistic(hass, statistic_id):
+    """
+    Return the last imported hour of a statistic
+    :param hass: hass object
+    :param statistic_id: statistic id
+    :return: (hour minute, state, sum), None if nothing was imported yet
+    """
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {'state', 'sum'}
+    )
+    rows = last.get(statistic_id)
+    if not rows:
+        return None
+    return (to_minute(rows[0]['start']), rows[0]['state'] or 0.0, rows[0]['sum'] or 0.0)
+
+
+async def async_sum_before(hass, statistic_id, minute):
+    """
+    Return the cumulative sum of the last imported hour before a given hour
+    :param hass: hass object
+    :param statistic_id: statistic id
+    :param minute: hour start epoch minute
+    :return: cumulative sum, 0 if no earlier hour was imported within the look-back
+    """
+    rows = await get_instance(hass).async_add_executor_job(
+        statistics_during_period, hass, to_utc(minute) - timedelta(days=STATISTICS_LOOKBACK),
+        to_utc(minute), {statistic_id}, 'hour', None, {'sum'}
+    )
+    rows = rows.get(statistic_id)
+    if not rows:
+        return 0.0
+    return rows[-1]['sum'] or 0.0
+
+
+async def async_import_statistics(hass, key, name, unit, read, changed, start, end):
+    """
+    Write the hourly totals of a series into the long-term statistics
+    Only the hours holding new or changed slots, and those after the last imported hour, are written.
+    The cumulative sum continues from the hour before the first written one.
+    :param hass: hass object
+    :param key: series key (mpxn, utility, reading type)
+    :param name: statistic name
+    :param unit: series unit
+    :param read: coroutine function taking (first, last) epoch minutes and returning the readings of the range
+    :param changed: list of new or changed (epoch minute, value) rows
+    :param start: window start epoch minute
+    :param end: window end epoch minute
+    :return: number of hours written
+    """
+    if 'recorder' not in hass.config.components:
+        return 0
+
+    statistic_id = get_statistic_id(key)
+    last = await async_last_statistic(hass, statistic_id)
+
+    # hours not imported yet, and every hour after a late slot since their sums move
+    first = start if last is None else last[0] + MINUTES_PER_HOUR
+    if changed:
+        first = min(first, hour_of(min(minute for minute, _ in changed)))
+    series = await read(max(first, start), end)
+    hours = sorted({hour_of(minute) for minute in series.minutes})
+    if not hours:
+        return 0
+
+    # cumulative sum before the first written hour
+    if last is None:
+        total = 0.0
+    elif hours[0] > last[0]:
+        total = last[2]
+    elif hours[0] == last[0]:
+        total = last[2] - last[1]
+    else:
+        total = await async_sum_before(hass, statistic_id, hours[0])
+
+    statistics = []
+    for hour in hours:
+        state = series.total(hour, hour + MINUTES_PER_HOUR - 1)
+        total += state
+        statistics.append(StatisticData(start=to_utc(hour), state=state, sum=total))
+
+    metadata = StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=name,
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement=UNITS.get(unit, unit)
+    )
+    async_add_external_statistics(hass, metadata, statistics)
+    _LOGGER.debug(f"[STATISTICS] Imported {len(statistics)} hours into {statistic_id}")
+    return len(statistics)
@@ -0,0 +1,224 @@
+"""
+Script file: store.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Cold tier of the n3rgy series store: archive segments loaded on demand under a memory budget
+"""
+
+import logging
+
+from collections import OrderedDict, namedtuple
+
+from .const import (
+    SEGMENT_DAYS,
+    SEGMENT_CACHE_BUDGET,
+    DEFAULT_BASE_LOAD_SLOTS
+)
+from .series import ReadingSeries
+from .rollup import MINUTES_PER_DAY, daily_totals, weekly_totals, monthly_totals, peak, base_load
+
+_LOGGER = logging.getLogger(__name__)
+
+# readings of a series evicted from memory, summarized for the window totals and rollups
+ColdSummary = namedtuple(
+    'ColdSummary',
+    ['bounds', 'first', 'last', 'total', 'rollups', 'tail', 'energy', 'daily_cost', 'tariff']
+)
+
+
+def series_bytes(series):
+    """
+    Return the memory held by the arrays of a series
+    :param series: reading series
+    :return: size in bytes
+    """
+    return len(series) * (series.minutes.itemsize + series.values.itemsize)
+
+
+def summarize(series, bounds, tariff=None):
+    """
+    Summarize the cold readings of a series
+    :param series: cold reading series
+    :param bounds: (first, last) epoch minute of the cold range
+    :param tariff: tariff table to price the readings with
+    :return: cold summary
+    """
+    if not series:
+        return ColdSummary(bounds, None, None, 0.0, None, ReadingSeries(), None, None, tariff)
+
+    rollups = {
+        'daily': daily_totals(series),
+        'weekly': weekly_totals(series),
+        'monthly': monthly_totals(series),
+        'peak': peak(series),
+        'base_load': base_load(series)
+    }
+
+    # the newest readings start the base load windows reaching into the hot window
+    index = max(len(series) - DEFAULT_BASE_LOAD_SLOTS + 1, 0)
+    tail = ReadingSeries(series.minutes[index:], series.values[index:])
+
+    energy = daily_cost = None
+    if tariff:
+        costs = tariff.costs(series)
+        energy = costs.total()
+        daily_cost = daily_totals(costs)
+    return ColdSummary(
+        bounds, series.first_minute, series.last_minute, series.total(), rollups, tail, energy, daily_cost, tariff
+    )
+
+
+def join_totals(older, newer):
+    """
+    Join two lists of bucket totals, adding up the bucket they share
+    :param older: list of (bucket start minute, total)
+    :param newer: list of (bucket start minute, total) starting at or after the last older bucket
+    :return: list of (bucket start minute, total)
+    """
+    if older and newer and older[-1][0] == newer[0][0]:
+        return older[:-1] + [(newer[0][0], older[-1][1] + newer[0][1])] + newer[1:]
+    return older + newer
+
+
+def merge_cold(data, cold):
+    """
+    Fold the cold summary of a series into the dataset built from its hot readings
+    The percentiles and the day of week profile cannot be combined from summaries and cover the hot window only,
+    as do the half-hour series of the readings and of their cost
+    :param data: series data
+    :param cold: cold summary
+    :return: none
+    """
+    data['total'] += cold.total
+    if cold.first is None:
+        return
+
+    series = data['series']
+    rollups = data['rollups']
+
+    # base load windows holding both cold and hot readings
+    head = ReadingSeries(series.minutes[:DEFAULT_BASE_LOAD_SLOTS - 1], series.values[:DEFAULT_BASE_LOAD_SLOTS - 1])
+    straddling = base_load(cold.tail.merge(head))
+
+    # the cold readings are older, so they come first and keep the peak and base load on a tie
+    peaks = [p for p in (cold.rollups['peak'], rollups['peak']) if p is not None]
+    base_loads = [b for b in (cold.rollups['base_load'], straddling, rollups['base_load']) if b is not None]
+    data['rollups'] = {
+        **rollups,
+        'daily': join_totals(cold.rollups['daily'], rollups['daily']),
+        'weekly': join_totals(cold.rollups['weekly'], rollups['weekly']),
+        'monthly': join_totals(cold.rollups['monthly'], rollups['monthly']),
+        'peak': max(peaks, key=lambda p: p[1]),
+        'base_load': min(base_loads, key=lambda b: b[1], default=None)
+    }
+
+    # the standing charges are counted once over the whole span
+    if cold.energy is not None:
+        cost = data.get('cost') or {'series': ReadingSeries(), 'daily': [], 'energy': 0.0}
+        energy = cost['energy'] + cold.energy
+        standing = cold.tariff.standing_charge(cold.first, series.last_minute if series else cold.last)
+        data['cost'] = {
+            **cost,
+            'daily': join_totals(cold.daily_cost, cost['daily']),
+            'energy': energy,
+            'standing': standing,
+            'total': energy + standing
+        }
+
+
+class SegmentCache:
+    """
+    Least recently used cache of archive segments.
+    A segment holds the readings of one series over a fixed number of days as a compact reading series.
+    Segments are read from the archive on first use and evicted once the memory budget is exceeded.
+    Shared by every coordinator so the budget holds for the whole fleet.
+    """
+
+    def __init__(self, hass, archive, budget=SEGMENT_CACHE_BUDGET, segment_days=SEGMENT_DAYS):
+        """
+        Initialize the segment cache
+        :param hass: hass object
+        :param archive: local reading archive
+        :param budget: memory budget in bytes
+        :param segment_days: days per segment
+        :return: none
+        """
+        self.hass = hass
+        self.archive = archive
+        self.budget = budget
+        self.span = segment_days * MINUTES_PER_DAY
+        self._segments = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def async_read(self, key, start, end):
+        """
+        Read the readings of a series within a time range through the cache
+        :param key: series key (mpxn, utility, reading type)
+        :param start: first epoch minute (inclusive)
+        :param end: last epoch minute (inclusive)
+        :return: reading series
+        """
+        series = ReadingSeries()
+        if end < start:
+            return series
+
+        for index in range(start // self.span, end // self.span + 1):
+            segment = self._segments.get((key, index))
+            if segment is not None:
+                self.hits += 1
+                self._segments.move_to_end((key, index))
+            else:
+                self.misses += 1
+                rows = await self.hass.async_add_executor_job(
+                    self.archive.read_range, key, index * self.span, (index + 1) * self.span - 1
+                )
+                segment = ReadingSeries.from_pairs(rows)
+                self._add((key, index), segment)
+            series = series.merge(segment.slice(start, end))
+        return series
+
+    def _add(self, name, segment):
+        """
+        Add a segment and evict the least recently used ones beyond the budget
+        :param name: (series key, segment index)
+        :param segment: reading series
+        :return: none
+        """
+        self._segments[name] = segment
+        self.size += series_bytes(segment)
+        while self.size > self.budget and len(self._segments) > 1:
+            _, evicted = self._segments.popitem(last=False)
+            self.size -= series_bytes(evicted)
+            self.evictions += 1
+
+    def invalidate(self, key, rows):
+        """
+        Drop the segments holding rows written to the archive
+        :param key: series key (mpxn, utility, reading type)
+        :param rows: iterable of (epoch minute, value)
+        :return: none
+        """
+        for index in {minute // self.span for minute, _ in rows}:
+            segment = self._segments.pop((key, index), None)
+            if segment is not None:
+                self.size -= series_bytes(segment)
+
+    def stats(self):
+        """
+        Return the cache statistics
+        :param: none
+        :return: dict
+        """
+        return {
+            'segments': len(self._segments),
+            'bytes': self.size,
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,162 @@
+"""
+Script file: tariff.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Tariff lookup table and cost computation for n3rgy readings
+"""
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+
+from .const import (
+    SLOT_MINUTES,
+    TARIFF_DATE_FORMAT
+)
+from .series import ReadingSeries, parse_reading_minute, to_epoch_minute
+from .rollup import MINUTES_PER_DAY, daily_totals
+
+
+class TariffTable:
+    """
+    Compact time-of-use price lookup table.
+    Prices are stored as change points only, each price applying until the next one,
+    and standing charges are stored per day start.
+    """
+
+    __slots__ = ('prices', 'standing_charges', 'first_slot', 'last_slot')
+
+    def __init__(self, prices=None, standing_charges=None):
+        """
+        Initialize a tariff table
+        :param prices: reading series of half-hour prices
+        :param standing_charges: reading series of daily standing charges keyed by day start minute
+        :return: none
+        """
+        prices = prices or ReadingSeries()
+        self.first_slot = prices.first_minute
+        self.last_slot = prices.last_minute
+        self.prices = compress(prices)
+        self.standing_charges = standing_charges or ReadingSeries()
+
+    def __bool__(self):
+        """
+        Return whether the table holds any price
+        :param: none
+        :return: true if not empty
+        """
+        return bool(self.prices)
+
+    def covers(self, start, end):
+        """
+        Return whether the table was built for a window containing the given one
+        :param start: first epoch minute
+        :param end: last epoch minute
+        :return: true if covered
+        """
+        return bool(self.prices) and self.first_slot <= start and self.last_slot >= end - SLOT_MINUTES + 1
+
+    def standing_charge(self, start, end):
+        """
+        Sum the daily standing charges over the days touched by a time range
+        :param start: first epoch minute
+        :param end: last epoch minute
+        :return: standing charge total
+        """
+        if not self.standing_charges:
+            return 0.0
+
+        charges = self.standing_charges
+        total = 0.0
+        for day in range(start - start % MINUTES_PER_DAY, end + 1, MINUTES_PER_DAY):
+            index = bisect_right(charges.minutes, day) - 1
+            if index >= 0:
+                total += charges.values[index]
+        return total
+
+    def costs(self, consumption):
+        """
+        Join a consumption series with the prices in a single merge pass
+        :param consumption: reading series
+        :return: reading series of half-hour costs
+        """
+        price_minutes = self.prices.minutes
+        price_values = self.prices.values
+        count = len(price_minutes)
+
+        minutes = array('q')
+        values = array('d')
+        index = -1
+        for minute, value in consumption.items():
+            while index + 1 < count and price_minutes[index + 1] <= minute:
+                index += 1
+            if index >= 0:
+                minutes.append(minute)
+                values.append(value * price_values[index])
+        return ReadingSeries(minutes, values)
+
+
+def parse_tariff(data):
+    """
+    Extract the half-hour prices and daily standing charges of an n3rgy tariff response
+    :param data: response data
+    :return: (price series, standing charge series keyed by day start minute)
+    """
+    prices = []
+    charges = []
+    if isinstance(data, dict):
+        for entry in data.get('values') or []:
+            if not isinstance(entry, dict):
+                continue
+            for price in entry.get('prices') or []:
+                try:
+                    prices.append((parse_reading_minute(price['timestamp']), price['value']))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            for charge in entry.get('standingCharges') or []:
+                try:
+                    day = datetime.strptime(charge['startDate'], TARIFF_DATE_FORMAT)
+                    charges.append((to_epoch_minute(day), charge['value']))
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+    return (ReadingSeries.from_pairs(prices), ReadingSeries.from_pairs(charges))
+
+
+def compress(prices):
+    """
+    Keep only the half-hours where the price changes
+    :param prices: reading series of half-hour prices
+    :return: reading series of price change points
+    """
+    minutes = array('q')
+    values = array('d')
+    for minute, value in prices.items():
+        if not values or values[-1] != value:
+            minutes.append(minute)
+            values.append(value)
+    return ReadingSeries(minutes, values)
+
+
+def compute_costs(consumption, tariff):
+    """
+    Compute the cost of a consumption series per half-hour and per day
+    :param consumption: reading series
+    :param tariff: tariff table
+    :return: dict of costs in the tariff currency unit, None without consumption or tariff
+    """
+    if not consumption or not tariff:
+        return None
+
+    series = tariff.costs(consumption)
+    energy = series.total()
+    standing = tariff.standing_charge(consumption.first_minute, consumption.last_minute)
+    return {
+        'series': series,
+        'daily': daily_totals(series),
+        'energy': energy,
+        'standing': standing,
+        'total': energy + standing
+    }
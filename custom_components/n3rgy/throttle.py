@@ -0,0 +1,341 @@
+"""
+Script file: throttle.py
+Created on: Oct 17, 2026
+Last modified on: Oct 17, 2026
+
+Comments:
+    Rate-limit-aware request scheduler for the n3rgy data API
+"""
+
+import time
+import random
+import asyncio
+import logging
+import threading
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from .const import (
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_BURST,
+    DEFAULT_MAX_RETRIES,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ST_TOO_MANY_REQUESTS = 429
+RETRY_STATUS = (ST_TOO_MANY_REQUESTS, 500, 502, 503, 504)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the n3rgy API is considered down"""
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header
+    :param value: header value, either seconds or an HTTP date
+    :return: seconds to wait or None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate while allowing short bursts"""
+
+    def __init__(self, rate, capacity):
+        """
+        Initialize the token bucket
+        :param rate: tokens added per second
+        :param capacity: maximum number of tokens
+        :return: none
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self):
+        """
+        Add the tokens earned since the last update
+        :param: none
+        :return: tokens available
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def reserve(self):
+        """
+        Take a token, possibly ahead of time
+        :param: none
+        :return: seconds to wait before the token may be used
+        """
+        self.refill()
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures, letting a single trial request through once the reset timeout passed"""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        """
+        Initialize the circuit breaker
+        :param failure_threshold: consecutive failures that open the circuit
+        :param reset_timeout: seconds the circuit stays open
+        :return: none
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.open_until = 0.0
+        self.trial = False
+
+    @property
+    def state(self):
+        """
+        Return the circuit state
+        :param: none
+        :return: 'closed', 'open' or 'half-open'
+        """
+        if self.open_until == 0.0:
+            return 'closed'
+        if time.monotonic() < self.open_until:
+            return 'open'
+        return 'half-open'
+
+    def allow(self):
+        """
+        Return whether a request may be sent
+        :param: none
+        :return: true if allowed
+        """
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half-open' and not self.trial:
+            self.trial = True
+            return True
+        return False
+
+    def open_for(self, seconds):
+        """
+        Open the circuit for a given time
+        :param seconds: time the circuit stays open
+        :return: none
+        """
+        self.open_until = max(self.open_until, time.monotonic() + seconds)
+        self.trial = False
+
+    def release_trial(self):
+        """
+        Give up a trial request that ended without an outcome, so that the next request may try
+        :param: none
+        :return: none
+        """
+        self.trial = False
+
+    def record_success(self):
+        """
+        Close the circuit
+        :param: none
+        :return: none
+        """
+        self.failures = 0
+        self.open_until = 0.0
+        self.trial = False
+
+    def record_failure(self):
+        """
+        Count a failure and open the circuit once the threshold is reached
+        :param: none
+        :return: none
+        """
+        self.failures += 1
+        if self.trial or self.failures >= self.failure_threshold:
+            if self.state != 'open':
+                _LOGGER.warning(f"[SCHEDULER] n3rgy API unavailable, pausing requests for {self.reset_timeout}s")
+            self.open_for(self.reset_timeout)
+
+
+class RequestScheduler:
+    """
+    Request scheduler shared by the n3rgy clients.
+    Every request takes a token from the bucket and goes through the circuit breaker.
+    Safe (GET) requests are retried on 429, 5xx and transport errors with jittered exponential
+    back-off, honoring Retry-After; other requests get a single attempt.
+    Both the sync and the asyncio clients can use the same instance.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, burst=DEFAULT_BURST, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_base=RETRY_BACKOFF_BASE, backoff_max=RETRY_BACKOFF_MAX,
+                 failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        """
+        Initialize the request scheduler
+        :param rate: sustained requests per second
+        :param burst: requests allowed in a burst
+        :param max_retries: retries of a safe request
+        :param backoff_base: first retry delay in seconds
+        :param backoff_max: longest retry delay in seconds, longer Retry-After values pause all requests instead
+        :param failure_threshold: consecutive failures that open the circuit
+        :param reset_timeout: seconds the circuit stays open
+        :return: none
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+
+    def idle(self, min_tokens):
+        """
+        Return whether low priority work may send requests without crowding out others
+        :param min_tokens: tokens that must be left for other requests
+        :return: true if the circuit is closed and enough tokens are available
+        """
+        with self._lock:
+            return self.breaker.state == 'closed' and self.bucket.refill() >= min_tokens
+
+    def _acquire(self):
+        """
+        Check the circuit and take a token
+        :param: none
+        :return: (seconds to wait before sending, true for the trial request of a half-open circuit)
+        """
+        with self._lock:
+            if not self.breaker.allow():
+                raise CircuitOpenError("n3rgy API circuit is open")
+            return (self.bucket.reserve(), self.breaker.trial)
+
+    def _release(self, trial):
+        """
+        Release the trial of an attempt aborted by cancellation or an unexpected error
+        :param trial: true if the attempt was the trial request
+        :return: none
+        """
+        if trial:
+            with self._lock:
+                self.breaker.release_trial()
+
+    def _outcome(self, status, headers, attempt, retries):
+        """
+        Record the outcome of an attempt and decide whether to retry
+        :param status: response status code, None on a transport error
+        :param headers: response headers
+        :param attempt: attempt number, starting at 0
+        :param retries: retries allowed
+        :return: seconds to wait before retrying, None to stop
+        """
+        retry_after = parse_retry_after(headers.get('Retry-After')) if headers else None
+        with self._lock:
+            if status is None or status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            if status is not None and status not in RETRY_STATUS:
+                return None
+
+            # no point in retrying once the circuit opened
+            if self.breaker.state == 'open':
+                return None
+
+            # the API asked for a longer pause than a retry is worth
+            if retry_after is not None and retry_after > self.backoff_max:
+                self.breaker.open_for(retry_after)
+                return None
+
+        if attempt >= retries:
+            return None
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def async_execute(self, send, errors=(), safe=True):
+        """
+        Send a request from the event loop
+        :param send: coroutine function returning (status, headers, result)
+        :param errors: transport exception types worth a retry
+        :param safe: true for requests that may be repeated (GET)
+        :return: (status, headers, result) of the last attempt
+        """
+        retries = self.max_retries if safe else 0
+        attempt = 0
+        while True:
+            delay, trial = self._acquire()
+            try:
+                if delay:
+                    await asyncio.sleep(delay)
+                outcome = await send()
+            except errors as err:
+                wait = self._outcome(None, None, attempt, retries)
+                if wait is None:
+                    raise
+                _LOGGER.debug(f"[SCHEDULER] Retrying in {wait:.1f}s after error: {str(err)}")
+            except BaseException:
+                # a trial that never got an outcome must not keep the circuit shut
+                self._release(trial)
+                raise
+            else:
+                wait = self._outcome(outcome[0], outcome[1], attempt, retries)
+                if wait is None:
+                    return outcome
+                _LOGGER.debug(f"[SCHEDULER] Retrying in {wait:.1f}s after status {outcome[0]}")
+
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    def execute(self, send, errors=(), safe=True):
+        """
+        Send a request from a worker thread
+        :param send: function returning (status, headers, result)
+        :param errors: transport exception types worth a retry
+        :param safe: true for requests that may be repeated (GET)
+        :return: (status, headers, result) of the last attempt
+        """
+        retries = self.max_retries if safe else 0
+        attempt = 0
+        while True:
+            delay, trial = self._acquire()
+            try:
+                if delay:
+                    time.sleep(delay)
+                outcome = send()
+            except errors as err:
+                wait = self._outcome(None, None, attempt, retries)
+                if wait is None:
+                    raise
+                _LOGGER.debug(f"[SCHEDULER] Retrying in {wait:.1f}s after error: {str(err)}")
+            except BaseException:
+                # a trial that never got an outcome must not keep the circuit shut
+                self._release(trial)
+                raise
+            else:
+                wait = self._outcome(outcome[0], outcome[1], attempt, retries)
+                if wait is None:
+                    return outcome
+                _LOGGER.debug(f"[SCHEDULER] Retrying in {wait:.1f}s after status {outcome[0]}")
+
+            time.sleep(wait)
+            attempt += 1